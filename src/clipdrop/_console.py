@@ -0,0 +1,5 @@
+"""Shared Rich console for ClipDrop's command-line output."""
+
+from rich.console import Console
+
+console = Console()
@@ -45,10 +45,10 @@ def get_text() -> Optional[str]:
         ContentTooLargeError: If content exceeds size limit
     """
     try:
-        # Check cache first
+        # Check cache first (an empty clipboard is cached too, so repeated
+        # checks don't each spawn pbpaste/xclip)
         current_time = time.time()
-        if (_clipboard_cache['content'] is not None and
-            current_time - _clipboard_cache['timestamp'] < _clipboard_cache['cache_duration']):
+        if current_time - _clipboard_cache['timestamp'] < _clipboard_cache['cache_duration']:
             return _clipboard_cache['content']
 
         content = pyperclip.paste()
@@ -73,6 +73,12 @@ def get_text() -> Optional[str]:
         return None
 
 
+def clear_cache() -> None:
+    """Clear the text cache so the next read goes to the clipboard."""
+    _clipboard_cache['content'] = None
+    _clipboard_cache['timestamp'] = 0
+
+
 def get_clipboard_text() -> str:
     """
     Get text content from clipboard (alias for consistency).
@@ -97,28 +103,37 @@ def get_clipboard_text() -> str:
         raise ClipboardAccessError(original_error=e)
 
 
-def has_content() -> bool:
+def has_content(content: Optional[str] = None) -> bool:
     """
     Check if clipboard has any content.
 
+    Args:
+        content: Previously fetched clipboard text; read from the
+                 clipboard only when omitted
+
     Returns:
         True if clipboard has content, False otherwise
     """
-    content = get_text()
+    if content is None:
+        content = get_text()
     return content is not None and len(content) > 0
 
 
-def get_content_preview(max_chars: int = 100) -> Optional[str]:
+def get_content_preview(max_chars: int = 100, content: Optional[str] = None) -> Optional[str]:
     """
     Get a preview of clipboard content.
 
     Args:
         max_chars: Maximum number of characters to return
+        content: Previously fetched clipboard text; read from the
+                 clipboard only when omitted
 
     Returns:
         Preview string or None if no content
     """
-    content = get_text()
+    if content is None:
+        # get_text() returns a fresh cached paste without re-reading
+        content = get_text()
     if content is None:
         return None
 
@@ -226,8 +241,7 @@ def wait_for_change(timeout: float = 10.0, poll_interval: float = 0.1) -> Option
             time.sleep(poll_interval)
 
             # Clear cache to force fresh read
-            _clipboard_cache['content'] = None
-            _clipboard_cache['timestamp'] = 0
+            clear_cache()
 
             current_content = get_text()
 
@@ -248,9 +262,7 @@ def clear_clipboard() -> None:
     """
     try:
         pyperclip.copy("")
-        # Clear cache
-        _clipboard_cache['content'] = None
-        _clipboard_cache['timestamp'] = 0
+        clear_cache()
     except Exception as e:
         raise ClipboardAccessError("Cannot clear clipboard", original_error=e)
 
@@ -440,14 +452,19 @@ def get_image() -> Optional['Image.Image']:
         raise ImageClipboardError("Failed to get image from clipboard", original_error=e)
 
 
-def get_image_info() -> Optional[Dict[str, Any]]:
+def get_image_info(img: Optional['Image.Image'] = None) -> Optional[Dict[str, Any]]:
     """
     Get information about the image in clipboard.
 
+    Args:
+        img: Previously fetched clipboard image; grabbed from the
+             clipboard only when omitted
+
     Returns:
         Dictionary with image info (width, height, mode, format) or None
     """
-    img = get_image()
+    if img is None:
+        img = get_image()
     if img is None:
         return None
 
@@ -461,10 +478,14 @@ def get_image_info() -> Optional[Dict[str, Any]]:
     }
 
 
-def get_content_type() -> str:
+def get_content_type(content: Optional[str] = None) -> str:
     """
     Determine what type of content is in the clipboard.
 
+    Args:
+        content: Previously fetched clipboard text; read from the
+                 clipboard only when omitted
+
     Returns:
         'html_mixed', 'both', 'image', 'text', or 'none'
     """
@@ -481,7 +502,7 @@ def get_content_type() -> str:
 
     # Check for regular image and text
     has_img = has_image()
-    has_txt = has_content()
+    has_txt = has_content(content)
 
     if has_img and has_txt:
         return 'both'
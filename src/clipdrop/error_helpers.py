@@ -1,11 +1,12 @@
 """User-friendly error messages and helpers for ClipDrop."""
 
-from typing import Optional, List, Dict, Any
+import functools
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
-from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
-console = Console()
+from clipdrop._console import console
 
 
 # Error message templates with suggestions
@@ -130,18 +131,47 @@ def display_error(error_type: str, context: Optional[Dict[str, Any]] = None,
         context: Optional context dictionary
         show_suggestions: Whether to show suggestions
     """
-    error_info = get_error_message(error_type, context)
+    if context:
+        lines = _render_error(get_error_message(error_type, context), show_suggestions)
+    else:
+        # Context-free messages never change, so parse their markup once
+        lines = _cached_error(error_type, show_suggestions)
+
+    # Prebuilt Text skips the console's highlighter, so apply it here as
+    # console.print would for a string (it styles a copy, not the cache)
+    for line in lines:
+        console.print(console.highlighter(line))
+
 
-    # Main error message
-    console.print(f"\n{error_info['icon']} [bold red]{error_info['message']}[/bold red]")
-    console.print(f"[yellow]{error_info['details']}[/yellow]\n")
+def _render_error(error_info: Dict[str, Any], show_suggestions: bool) -> Tuple[Text, ...]:
+    """
+    Parse an error message and its suggestions into printable lines.
+
+    Args:
+        error_info: Error message dictionary from get_error_message
+        show_suggestions: Whether to include suggestions
+
+    Returns:
+        Tuple of Text lines, ready for console.print
+    """
+    markup = [
+        f"\n{error_info['icon']} [bold red]{error_info['message']}[/bold red]",
+        f"[yellow]{error_info['details']}[/yellow]\n",
+    ]
 
-    # Show suggestions
     if show_suggestions and 'suggestions' in error_info:
-        console.print("[bold cyan]💡 Try these solutions:[/bold cyan]")
+        markup.append("[bold cyan]💡 Try these solutions:[/bold cyan]")
         for i, suggestion in enumerate(error_info['suggestions'], 1):
-            console.print(f"  {i}. {suggestion}")
-        console.print()
+            markup.append(f"  {i}. {suggestion}")
+        markup.append("")
+
+    return tuple(Text.from_markup(line) for line in markup)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_error(error_type: str, show_suggestions: bool) -> Tuple[Text, ...]:
+    """Render a context-free error message once and reuse it."""
+    return _render_error(get_error_message(error_type), show_suggestions)
 
 
 def suggest_similar_files(attempted_path: str, directory: Path = Path('.')) -> List[str]:
@@ -0,0 +1,95 @@
+"""JSON helpers that use orjson when it is installed.
+
+orjson is an optional speedup (``pip install clipdrop[speedups]``). Every
+helper falls back to the standard library. Inputs orjson rejects but the
+stdlib accepts (NaN) are retried with the stdlib, and documents with
+integer literals too wide for 64 bits, which orjson would silently parse
+as floats, go straight to the stdlib. Both backends produce equivalent
+JSON, but the output is not byte-identical (e.g. float formatting differs).
+"""
+
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 20+ digit runs may not fit in 64 bits; orjson reads those as floats.
+# A match inside a string or fraction only costs a stdlib parse.
+_WIDE_DIGITS = re.compile(r'\d{20,}')
+_WIDE_DIGITS_BYTES = re.compile(rb'\d{20,}')
+
+
+def _may_overflow(data: Union[str, bytes, bytearray]) -> bool:
+    """Return True if data has a digit run orjson could parse lossily."""
+    pattern = _WIDE_DIGITS if isinstance(data, str) else _WIDE_DIGITS_BYTES
+    return pattern.search(data) is not None
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text, as str or UTF-8 bytes
+
+    Returns:
+        The decoded Python object
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    if orjson is not None and not _may_overflow(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Retry with the stdlib, which is more permissive
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """
+    Serialize an object as 2-space indented JSON.
+
+    Non-ASCII characters are written as-is rather than escaped.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def reformat_pretty(text: Union[str, bytes]) -> bytes:
+    """
+    Re-indent a JSON document with 2-space indentation.
+
+    Parsing and serializing use the same backend, so values only the
+    stdlib understands (NaN, Infinity, integers wider than 64 bits)
+    round-trip unchanged.
+
+    Args:
+        text: JSON text to reformat
+
+    Returns:
+        UTF-8 encoded, indented JSON
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    if orjson is not None and not _may_overflow(text):
+        try:
+            return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2)
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            pass  # Retry with the stdlib, which is more permissive
+    return json.dumps(json.loads(text), indent=2, ensure_ascii=False).encode('utf-8')
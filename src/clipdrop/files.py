@@ -2,15 +2,18 @@
 
 import json
 import gzip
+import os
 import tempfile
 import shutil
 from datetime import datetime
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 from typing import Union, Optional
 import typer
-from rich.console import Console
 from rich.prompt import Confirm
 
+from clipdrop import fastjson
+from clipdrop._console import console
 from clipdrop.exceptions import (
     FilePermissionError,
     FileExistsError as ClipDropFileExistsError,
@@ -18,7 +21,19 @@ from clipdrop.exceptions import (
     PathTraversalError,
 )
 
-console = Console()
+# Characters that are unsafe in filenames across common filesystems
+_INVALID_FILENAME_CHARS = '/\\\0:*?"<>|'
+_INVALID_FILENAME_SET = frozenset(_INVALID_FILENAME_CHARS)
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in _INVALID_FILENAME_CHARS})
+
+# Buffer size for file writes (fewer write() syscalls on large content)
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Characters encoded per step when streaming large text to disk
+WRITE_CHUNK_CHARS = 64 * 1024
+
+# JSON larger than this is written as-is rather than parsed and re-indented
+PRETTY_JSON_LIMIT = 1024 * 1024
 
 
 def check_exists(path: Path) -> bool:
@@ -31,7 +46,13 @@ def check_exists(path: Path) -> bool:
     Returns:
         True if file exists, False otherwise
     """
-    return path.exists() and path.is_file()
+    # A single stat() instead of exists() followed by is_file(); like
+    # Path.exists(), anything stat() can't resolve (symlink loop, no
+    # permission, embedded NUL) counts as not there
+    try:
+        return S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
 
 
 def ensure_parent_dir(path: Path) -> None:
@@ -45,11 +66,11 @@ def ensure_parent_dir(path: Path) -> None:
         PermissionError: If directory cannot be created
     """
     parent = path.parent
-    if not parent.exists():
-        try:
-            parent.mkdir(parents=True, exist_ok=True)
-        except PermissionError as e:
-            raise PermissionError(f"Cannot create directory {parent}: {e}")
+    try:
+        # mkdir(exist_ok=True) is already idempotent; no exists() pre-check
+        parent.mkdir(parents=True, exist_ok=True)
+    except PermissionError as e:
+        raise PermissionError(f"Cannot create directory {parent}: {e}")
 
 
 def confirm_overwrite(path: Path) -> bool:
@@ -68,18 +89,63 @@ def confirm_overwrite(path: Path) -> bool:
     )
 
 
-def get_file_size(content: str) -> str:
+def _open_for_write(path: Path, force: bool) -> int:
     """
-    Get human-readable file size for content.
+    Open a file for writing, confirming before replacing an existing one.
+
+    The file is created with O_EXCL, so checking for an existing file and
+    creating a new one is a single syscall with no race between the two.
+
+    Args:
+        path: Path of the file to open
+        force: If True, overwrite without asking
+
+    Returns:
+        File descriptor open for writing (truncated)
+
+    Raises:
+        typer.Abort: If user cancels overwrite
+        IsADirectoryError: If a directory exists at path
+        OSError: If the file cannot be opened, or path is not a regular file
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+    if force:
+        return os.open(path, flags, 0o666)
+
+    try:
+        return os.open(path, flags | os.O_EXCL, 0o666)
+    except FileExistsError:
+        # Only a regular file can be overwritten; don't ask about anything else
+        mode = os.stat(path).st_mode
+        if S_ISDIR(mode):
+            raise IsADirectoryError(f"{path} is a directory")
+        if not S_ISREG(mode):
+            raise OSError(f"{path} is not a regular file")
+        if not confirm_overwrite(path):
+            console.print("[yellow]Operation cancelled.[/yellow]")
+            raise typer.Abort()
+        return os.open(path, flags, 0o666)
+
+
+def get_content_size(content: str) -> int:
+    """
+    Get the UTF-8 encoded size of content in bytes.
+
+    ASCII-only text (the common case) is measured without encoding it.
 
     Args:
         content: String content to measure
 
     Returns:
-        Human-readable size string (e.g., "1.2 KB")
+        Size in bytes
     """
-    size_bytes = len(content.encode('utf-8'))
+    if content.isascii():
+        return len(content)
+    return len(content.encode('utf-8'))
+
 
+def _format_size(size_bytes: float) -> str:
+    """Format a byte count as a human-readable string (e.g., "1.2 KB")."""
     for unit in ['B', 'KB', 'MB']:
         if size_bytes < 1024.0:
             if unit == 'B':
@@ -91,6 +157,42 @@ def get_file_size(content: str) -> str:
     return f"{size_bytes:.1f} GB"
 
 
+def get_file_size(content: Union[str, int]) -> str:
+    """
+    Get human-readable file size for content.
+
+    Args:
+        content: String content to measure, or its already-computed
+                 size in bytes
+
+    Returns:
+        Human-readable size string (e.g., "1.2 KB")
+    """
+    if isinstance(content, str):
+        content = get_content_size(content)
+    return _format_size(content)
+
+
+def _should_prettify_json(content: str) -> bool:
+    """
+    Decide whether JSON content is worth parsing and re-indenting.
+
+    Large documents are skipped to avoid building the full object tree, and
+    content that already opens with an indented line is assumed to be
+    pretty-printed.
+
+    Args:
+        content: JSON text about to be written
+
+    Returns:
+        True if the content should be reformatted
+    """
+    if len(content) >= PRETTY_JSON_LIMIT:
+        return False
+    head = content[:64].lstrip()
+    return head[:3] not in ('{\n ', '[\n ')
+
+
 def write_text(path: Union[Path, str], content: str, force: bool = False) -> None:
     """
     Write text content to a file.
@@ -122,25 +224,42 @@ def write_text(path: Union[Path, str], content: str, force: bool = False) -> Non
     # Ensure parent directory exists
     ensure_parent_dir(path)
 
-    # Handle overwrite confirmation
-    if check_exists(path) and not force:
-        if not confirm_overwrite(path):
-            console.print("[yellow]Operation cancelled.[/yellow]")
-            raise typer.Abort()
+    # Encode exactly once. JSON is pretty-printed straight to bytes; large
+    # plain text is encoded chunk by chunk while writing so a second full
+    # copy of the content is never held in memory.
+    data: Optional[bytes] = None
+    if path.suffix.lower() == '.json' and _should_prettify_json(content):
+        try:
+            data = fastjson.reformat_pretty(content)
+        except json.JSONDecodeError:
+            # If it's not valid JSON, write as-is
+            pass
+        except UnicodeEncodeError as e:
+            # A \ud800-style escape decodes to a lone surrogate
+            raise Exception(f"Failed to write file: {e}")
+    if data is None and len(content) <= WRITE_BUFFER_SIZE:
+        try:
+            data = content.encode('utf-8')
+        except UnicodeEncodeError as e:
+            # e.g. lone surrogates from clipboard bytes that weren't UTF-8;
+            # reported like any other write failure, before the file is touched
+            raise Exception(f"Failed to write file: {e}")
 
-    # Write the file
+    # Open (creating or confirming overwrite) and write the file
     try:
-        # Handle JSON specially for pretty printing
-        if path.suffix.lower() == '.json':
-            try:
-                # Try to parse and pretty-print JSON
-                json_data = json.loads(content)
-                content = json.dumps(json_data, indent=2, ensure_ascii=False)
-            except json.JSONDecodeError:
-                # If it's not valid JSON, write as-is
-                pass
-
-        path.write_text(content, encoding='utf-8')
+        fd = _open_for_write(path, force)
+    except PermissionError as e:
+        raise PermissionError(f"Cannot write to {path}: {e}")
+    except OSError as e:
+        raise Exception(f"Failed to write file: {e}")
+
+    try:
+        with open(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            if data is not None:
+                f.write(data)
+            else:
+                for start in range(0, len(content), WRITE_CHUNK_CHARS):
+                    f.write(content[start:start + WRITE_CHUNK_CHARS].encode('utf-8'))
 
     except PermissionError as e:
         raise PermissionError(f"Cannot write to {path}: {e}")
@@ -159,8 +278,7 @@ def validate_filename(filename: str) -> bool:
         True if valid, False otherwise
     """
     # Check for invalid characters
-    invalid_chars = ['/', '\\', '\0', ':', '*', '?', '"', '<', '>', '|']
-    if any(char in filename for char in invalid_chars):
+    if not _INVALID_FILENAME_SET.isdisjoint(filename):
         return False
 
     # Check for path traversal
@@ -216,14 +334,9 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Replace invalid characters with underscore
-    invalid_chars = ['/', '\\', '\0', ':', '*', '?', '"', '<', '>', '|']
-    sanitized = filename
-    for char in invalid_chars:
-        sanitized = sanitized.replace(char, '_')
-
-    # Remove path traversal attempts
-    sanitized = sanitized.replace('..', '_')
+    # Replace invalid characters with underscore, then remove path
+    # traversal attempts
+    sanitized = filename.translate(_SANITIZE_TABLE).replace('..', '_')
 
     # Ensure it's not empty after sanitization
     # Also handle cases where everything becomes underscores
@@ -594,7 +707,7 @@ def get_file_metadata(path: Union[Path, str]) -> dict:
         }
 
     stat = path.stat()
-    size_human = get_file_size("x" * stat.st_size)  # Reuse size formatting
+    size_human = _format_size(stat.st_size)
 
     return {
         'exists': True,
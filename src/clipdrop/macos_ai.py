@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import functools
 import json
 import platform
 import subprocess
+import threading
 from dataclasses import dataclass
 from importlib.resources import files
 from pathlib import Path
-from typing import Any, Callable, Generator, Optional
+from typing import IO, Any, Callable, Generator, Iterator, Optional
 
+from . import fastjson
 from .chunking import DEFAULT_MAX_CHUNK_CHARS, ChunkedSummarizationRequest, build_chunked_request
 
 
@@ -61,10 +64,14 @@ def get_macos_version() -> Optional[tuple[int, int]]:
     return None
 
 
+@functools.cache
 def helper_path() -> str:
     """
     Return the filesystem path to the Swift transcription helper.
 
+    The result is cached for the life of the process (failures are not
+    cached, so they are re-checked on the next call).
+
     Raises:
         UnsupportedPlatformError: If not on macOS
         UnsupportedMacOSVersionError: If macOS version < 26.0
@@ -193,6 +200,74 @@ def ocr_image(image: Any, lang: Optional[str] = None, timeout: int = 30) -> str:
         tmp_path.unlink(missing_ok=True)
 
 
+# Read size for draining helper stdout
+_READ_CHUNK_SIZE = 65536
+
+
+def _iter_jsonl_records(stream: IO[bytes]) -> Iterator[bytes]:
+    """Yield complete, non-empty JSONL records from a binary stream.
+
+    Reads large chunks and scans for newlines instead of iterating lines in
+    text mode, so decoding and line splitting stay out of the hot loop.
+    """
+    read = getattr(stream, "read1", stream.read)
+    buf = bytearray()
+    while True:
+        chunk = read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+        start = 0
+        while True:
+            idx = buf.find(b"\n", start)
+            if idx < 0:
+                break
+            record = bytes(buf[start:idx]).strip()
+            if record:
+                yield record
+            start = idx + 1
+        if start:
+            del buf[:start]
+
+    # Final record without a trailing newline
+    record = bytes(buf).strip()
+    if record:
+        yield record
+
+
+def _drain_in_background(stream: Optional[IO[Any]]) -> Callable[[], str]:
+    """Read a pipe to EOF on a daemon thread so the child never blocks on it.
+
+    A helper that writes more than a pipe buffer's worth (~64KB) to stderr
+    while we are still reading stdout would otherwise deadlock.
+
+    Returns:
+        A function that waits for the pipe to close and returns its
+        contents as stripped text.
+    """
+    chunks: list[Any] = []
+
+    def _drain() -> None:
+        if stream is None:
+            return
+        while True:
+            chunk = stream.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    thread = threading.Thread(target=_drain, daemon=True)
+    thread.start()
+
+    def collect() -> str:
+        thread.join()
+        if chunks and isinstance(chunks[0], bytes):
+            return b"".join(chunks).decode("utf-8", errors="replace").strip()
+        return "".join(chunks).strip()
+
+    return collect
+
+
 def transcribe_from_clipboard(lang: str | None = None) -> list[dict[str, Any]]:
     """Invoke the Swift helper and parse JSONL transcription segments from stdout."""
     exe = helper_path()  # Now raises specific exceptions
@@ -205,21 +280,23 @@ def transcribe_from_clipboard(lang: str | None = None) -> list[dict[str, Any]]:
         args,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
+        bufsize=-1,
     )
 
-    segments: list[dict[str, Any]] = []
+    collect_stderr = _drain_in_background(proc.stderr)
+
     if proc.stdout is None:
         raise RuntimeError("Failed to capture transcription helper output")
-    for line in proc.stdout:
-        line = line.strip()
-        if not line:
-            continue
-        segments.append(json.loads(line))
+    # Parsed in one pass as lines arrive, with no preallocation: the helper
+    # sends no segment count, and buffering stdout to count lines would
+    # hold the raw output and the parsed segments in memory at once.
+    segments: list[dict[str, Any]] = list(
+        map(fastjson.loads, _iter_jsonl_records(proc.stdout))
+    )
 
     code = proc.wait()
+    err = collect_stderr()
     if code != 0:
-        err = proc.stderr.read().strip() if proc.stderr else ""
         # Map exit codes to specific error messages
         if code == 1:
             raise RuntimeError("No audio file found in clipboard")
@@ -267,6 +344,8 @@ def transcribe_from_clipboard_stream(
         bufsize=1,  # Line buffered for real-time streaming
     )
 
+    collect_stderr = _drain_in_background(proc.stderr)
+
     segment_count = 0
     try:
         if proc.stdout is None:
@@ -277,7 +356,7 @@ def transcribe_from_clipboard_stream(
                 continue
 
             try:
-                segment = json.loads(line)
+                segment = fastjson.loads(line)
                 segment_count += 1
 
                 # Call progress callback if provided
@@ -291,8 +370,8 @@ def transcribe_from_clipboard_stream(
 
         # Check for errors after stream ends
         code = proc.wait()
+        err = collect_stderr()
         if code != 0:
-            err = proc.stderr.read().strip() if proc.stderr else ""
             # Map exit codes to specific error messages
             if code == 1:
                 raise RuntimeError("No audio file found in clipboard")
@@ -2,23 +2,16 @@ import os
 import re
 import sys
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 import typer
-from rich.console import Console
 from rich.panel import Panel
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeElapsedColumn,
-)
-from rich.syntax import Syntax
 from rich.prompt import Confirm, IntPrompt
 from rich.table import Table
 
 from clipdrop import __version__
+from clipdrop._console import console
 from clipdrop import clipboard, detect, files, images, pdf, richtext
 from clipdrop import history as history_store
 from clipdrop.macos_ai import summarize_content, summarize_content_with_chunking
@@ -60,7 +53,17 @@ class ExitCode:
     NO_SPEECH = 3          # Audio found but no speech detected
     TRANSCRIPTION_ERROR = 4  # General transcription failure
 
-console = Console()
+# Syntax-highlighting lexers for the text preview, keyed by file extension
+_PREVIEW_LEXERS = MappingProxyType({
+    '.json': 'json',
+    '.md': 'markdown',
+    '.py': 'python',
+    '.js': 'javascript',
+    '.html': 'html',
+    '.css': 'css',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+})
 
 
 def _split_sentences(text: str) -> list[str]:
@@ -257,6 +260,14 @@ def summarize_document(
         chunk_timeout = max(60, min(240, 30 + chunk_estimate * 8))
         fallback_chunk_info = chunk_estimate
 
+        from rich.progress import (
+            BarColumn,
+            Progress,
+            SpinnerColumn,
+            TextColumn,
+            TimeElapsedColumn,
+        )
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -1328,6 +1339,8 @@ def handle_format_bridge(
             raise typer.Exit(0)
 
     if preview:
+        from rich.syntax import Syntax  # pulls in Pygments; only needed here
+
         console.print(Panel(
             Syntax(result, config['lexer'], word_wrap=True),
             title=config['preview_title'],
@@ -1643,6 +1656,10 @@ def main(
 
     [dim]For more help, visit: https://github.com/prateekjain24/clipdrop[/dim]
     """
+    # Start every invocation from a fresh clipboard read; later reads in
+    # this run are served from the clipboard module's cache
+    clipboard.clear_cache()
+
     # Define paranoid variables for compatibility
     paranoid_flag = scan
     paranoid_mode = scan_mode
@@ -1759,8 +1776,11 @@ def main(
         raise typer.Exit(1)
 
     try:
+        # Read the clipboard text once; everything below derives from it
+        content = clipboard.get_text()
+
         # Determine content type in clipboard
-        content_type = clipboard.get_content_type()
+        content_type = clipboard.get_content_type(content)
         active_paranoid = paranoid_mode or (ParanoidMode.PROMPT if paranoid_flag else None)
 
         if content_type == 'none':
@@ -1777,8 +1797,7 @@ def main(
             console.print("[red]❌ Cannot use both --text-only and --image-only.[/red]")
             raise typer.Exit(1)
 
-        # Get both text and image content (may be None)
-        content = clipboard.get_text()
+        # Get image content (may be None); text was read above
         image = clipboard.get_image()
 
         # OCR mode - extract text from a clipboard image and treat it as text
@@ -1892,7 +1911,7 @@ def main(
                     preview_text = content[:100] + "..." if len(content) > 100 else content
                     preview_parts.append(f"[dim]{preview_text}[/dim]")
                 if image:
-                    info = clipboard.get_image_info()
+                    info = clipboard.get_image_info(image)
                     if info:
                         preview_parts.append(f"\n[cyan]Image:[/cyan] {info['width']}x{info['height']} pixels, {info['mode']} mode")
 
@@ -1944,7 +1963,7 @@ def main(
 
             # Show preview if requested
             if preview:
-                info = clipboard.get_image_info()
+                info = clipboard.get_image_info(image)
                 if info:
                     console.print(Panel(
                         f"[cyan]Image Preview[/cyan]\n"
@@ -2017,19 +2036,11 @@ def main(
                 preview_content = content[:200] if content else None
                 if preview_content:
                     # Determine syntax highlighting based on extension
-                    lexer_map = {
-                        '.json': 'json',
-                        '.md': 'markdown',
-                        '.py': 'python',
-                        '.js': 'javascript',
-                        '.html': 'html',
-                        '.css': 'css',
-                        '.yaml': 'yaml',
-                        '.yml': 'yaml',
-                    }
-                    lexer = lexer_map.get(file_path.suffix.lower(), 'text')
+                    lexer = _PREVIEW_LEXERS.get(file_path.suffix.lower(), 'text')
 
                     # Show syntax-highlighted preview
+                    from rich.syntax import Syntax  # pulls in Pygments
+
                     syntax = Syntax(
                         preview_content,
                         lexer,
@@ -2045,9 +2056,9 @@ def main(
                         raise typer.Exit()
 
             # Check for large content warning
-            content_size = len(content.encode('utf-8'))
+            content_size = files.get_content_size(content)
             if content_size > 10 * 1024 * 1024:  # 10MB
-                size_str = files.get_file_size(content)
+                size_str = files.get_file_size(content_size)
                 if not force:
                     if not Confirm.ask(f"[yellow]⚠️  Large clipboard content ({size_str}). Continue?[/yellow]"):
                         console.print("[yellow]Operation cancelled.[/yellow]")
@@ -2082,7 +2093,7 @@ def main(
                 files.write_text(file_path, content, force=force)
 
                 # Success message
-                size_str = files.get_file_size(content)
+                size_str = files.get_file_size(content_size)
                 content_format = detect.detect_format(content)
                 show_success_message(
                     file_path,
@@ -1,14 +1,22 @@
 """YouTube URL handling and yt-dlp integration."""
 
+import functools
 import json
 import os
 import re
-import shutil
-import subprocess
+import threading
 import time
-from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import TYPE_CHECKING, NamedTuple, Optional, Set, Tuple, List, Dict, Any
+from urllib.parse import urlsplit
+
+from . import fastjson
+
+# datetime, shutil and subprocess are imported where used: URL parsing, the
+# most common use of this module, needs none of them
+if TYPE_CHECKING:
+    import subprocess
 
 # Environment variables for working around YouTube blocking.
 # YouTube aggressively bot-checks datacenter/VPN IPs and rate-limits the
@@ -28,6 +36,76 @@ METADATA_CACHE_DAYS = 7
 MAX_ATTEMPTS = 3
 RETRY_BASE_DELAY = 2.0  # seconds; doubles each retry
 
+# Output template for the metadata fetch: a single JSON object holding only
+# the fields we use. A full -J dump also carries every format and
+# thumbnail, often hundreds of KB that would be piped and parsed for nothing.
+_METADATA_FIELDS = (
+    'title', 'id', 'uploader', 'duration', 'upload_date', 'description',
+    'view_count', 'like_count', 'chapters', 'subtitles', 'automatic_captions',
+)
+_METADATA_TEMPLATE = '%(.{' + ','.join(_METADATA_FIELDS) + '})j'
+
+# Score of a manual caption exactly matching the preferred language
+_BEST_CAPTION_SCORE = 110
+
+# Characters replaced with '_' when a video title becomes a filename
+_TITLE_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Cache directories ensure_cache_dir() has already checked or created
+_ENSURED_DIRS: Set[Path] = set()
+
+# Environment variable Path.home() reads on this platform
+_HOME_ENV = 'USERPROFILE' if os.name == 'nt' else 'HOME'
+
+# In-process metadata for recently fetched videos, keyed on
+# (video_id, cache_dir), in front of the on-disk metadata.json cache
+_METADATA_MEMO: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+_METADATA_MEMO_SIZE = 32
+
+# Hosts that serve YouTube videos, and the path prefixes followed by an ID
+_YOUTUBE_HOSTS = frozenset(
+    f'{sub}{domain}'
+    for sub in ('', 'www.', 'm.', 'music.')
+    for domain in ('youtube.com', 'youtu.be')
+)
+_NOCOOKIE_HOST = 'www.youtube-nocookie.com'
+_ID_PATH_PREFIXES = ('/shorts/', '/live/', '/v/', '/embed/', '/e/', '/watch/', '/')
+_OEMBED_HOSTS = frozenset({'www.youtube.com', 'm.youtube.com', 'music.youtube.com'})
+
+# The encoded /watch?v= at the start of an attribution_link's u= parameter
+_ATTRIBUTION_WATCH_RE = re.compile(r'(?:/|%2F)watch(?:\?|%3F)v(?:=|%3D)', re.IGNORECASE)
+
+# yt-dlp's date-based version string, YYYY.MM.DD
+_YTDLP_VERSION_RE = re.compile(r'^(\d{4})\.(\d{1,2})\.(\d{1,2})')
+
+# VTT cue timing line; handles both HH:MM:SS.mmm and MM:SS.mmm formats
+_VTT_TIMESTAMP_RE = re.compile(
+    r'(\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3})\s*-->\s*(\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3})'
+)
+# Inline HTML-style tags and VTT positioning blocks stripped from cue text
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+_VTT_POSITION_RE = re.compile(r'\{.*?\}')
+
+# Characters allowed in a video ID
+_VIDEO_ID_CHARS = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-'
+)
+
+# Video ID extraction: one alternation, so a URL is scanned once. Each
+# branch has exactly one capture group; match.lastindex says which matched.
+# It runs on the lowercased URL (see _lowercase_same_length) rather than
+# with re.IGNORECASE, and the ID is sliced from the original URL.
+_VIDEO_ID_RE = re.compile(
+    # youtu.be/VIDEO_ID
+    r'youtu\.be/([a-z0-9_\-]{11})'
+    # youtube.com/watch?v=VIDEO_ID (and variants with additional parameters)
+    r'|[?&]v=([a-z0-9_\-]{11})(?:[&#]|$)'
+    # /embed/, /v/, /shorts/ and /live/ VIDEO_ID (youtube-nocookie included)
+    r'|(?:embed|v|shorts|live)/([a-z0-9_\-]{11})(?:[?&#]|$)'
+    # attribution_link with encoded watch URL
+    r'|attribution_link\?.*u=(?:/|%2f)watch(?:\?|%3f)v(?:=|%3d)([a-z0-9_\-]{11})'
+)
+
 
 def validate_youtube_url(url: str) -> bool:
     """
@@ -49,16 +127,101 @@ def validate_youtube_url(url: str) -> bool:
     Returns:
         True if valid YouTube URL, False otherwise
     """
-    if not url:
-        return False
+    return parse_youtube_url(url) is not None
 
-    # Comprehensive regex pattern for YouTube URLs
-    pattern = r'^(?:(?:https?:)?\/\/)?(?:(?:(?:www|m(?:usic)?)\.)?youtu(?:\.be|be\.com)\/(?:shorts\/|live\/|v\/|e(?:mbed)?\/|watch(?:\/|\?(?:\S+=\S+&)*v=)|oembed\?url=https?:\/\/(?:www|m(?:usic)?)\.youtube\.com\/watch\?(?:\S+=\S+&)*v=|attribution_link\?(?:\S+=\S+&)*u=(?:\/|%2F)watch(?:\?|%3F)v(?:=|%3D))?|www\.youtube-nocookie\.com\/embed\/)([\w\-]{11})(?:[\?&#].*)?$'
 
-    match = re.match(pattern, url, re.IGNORECASE)
-    return match is not None
+def _leading_id(text: str) -> Optional[str]:
+    """Return the video ID at the start of text, if it is a complete one."""
+    # The ID must be followed by the end or by more query/fragment
+    candidate = text[:11]
+    if _is_video_id(candidate) and text[11:12] in ('', '?', '&', '#'):
+        return candidate
+    return None
 
 
+@functools.lru_cache(maxsize=1024)
+def parse_youtube_url(url: str) -> Optional[str]:
+    """
+    Validate a YouTube URL and extract its video ID in a single pass.
+
+    Accepts exactly the URL forms listed in validate_youtube_url(). Use
+    this instead of calling validate_youtube_url() and then
+    extract_video_id() on the same URL. Results are memoized, as one
+    command parses the same URL several times.
+
+    Args:
+        url: The URL string to parse
+
+    Returns:
+        The 11-character video ID if url is a supported YouTube video URL,
+        None otherwise
+    """
+    # Every supported host contains 'youtu'; reject anything else before
+    # splitting the URL
+    if not url or 'youtu' not in url.lower():
+        return None
+
+    # Only http(s) and scheme-less URLs are accepted; anything else ends up
+    # in the netloc and fails the host check below
+    if not url[:8].lower().startswith(('http://', 'https://', '//')):
+        url = '//' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+
+    host = parts.netloc.lower()
+    path = parts.path
+    lowered = path.lower()
+    query = parts.query
+
+    if host == _NOCOOKIE_HOST:
+        return _leading_id(path[7:]) if lowered.startswith('/embed/') else None
+    if host not in _YOUTUBE_HOSTS:
+        return None
+
+    if lowered == '/watch':
+        # The first valid v= wins; params without a value, malformed ones
+        # and invalid IDs are skipped
+        for param in query.split('&'):
+            if param[:2].lower() == 'v=':
+                video_id = _leading_id(param[2:])
+                if video_id:
+                    return video_id
+        return None
+
+    if lowered == '/oembed':
+        if query[:4].lower() != 'url=':
+            return None
+        inner = query[4:]
+        try:
+            inner_parts = urlsplit(inner)
+        except ValueError:
+            return None
+        if (
+            inner_parts.scheme.lower() not in ('http', 'https')
+            or inner_parts.netloc.lower() not in _OEMBED_HOSTS
+            or inner_parts.path.lower() != '/watch'
+        ):
+            return None
+        return parse_youtube_url(inner)
+
+    if lowered == '/attribution_link':
+        for param in query.split('&'):
+            if param[:2].lower() == 'u=':
+                match = _ATTRIBUTION_WATCH_RE.match(param, 2)
+                video_id = _leading_id(param[match.end():]) if match else None
+                if video_id:
+                    return video_id
+        return None
+
+    for prefix in _ID_PATH_PREFIXES:
+        if lowered.startswith(prefix):
+            return _leading_id(path[len(prefix):])
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> Optional[str]:
     """
     Extract the 11-character video ID from a YouTube URL.
@@ -75,39 +238,85 @@ def extract_video_id(url: str) -> Optional[str]:
     # Remove any whitespace
     url = url.strip()
 
-    # Pattern 1: youtu.be/VIDEO_ID
-    match = re.search(r'youtu\.be\/([a-zA-Z0-9_\-]{11})', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    # Every pattern needs a '/' or a 'v='; plain text never reaches them
+    if '/' not in url and '=' not in url:
+        return None
+
+    lowered = _lowercase_same_length(url)
 
-    # Pattern 2: youtube.com/watch?v=VIDEO_ID (and variants with additional parameters)
-    match = re.search(r'[?&]v=([a-zA-Z0-9_\-]{11})(?:[&#]|$)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    # Most URLs are youtu.be/ID or watch?v=ID; find those without regex
+    video_id = _fast_video_id(url, lowered)
+    if video_id:
+        return video_id
 
-    # Pattern 3: youtube.com/embed/VIDEO_ID or /v/VIDEO_ID
-    match = re.search(r'(?:embed|v)\/([a-zA-Z0-9_\-]{11})(?:[?&#]|$)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    match = _VIDEO_ID_RE.search(lowered)
+    return url[match.start(match.lastindex):match.end(match.lastindex)] if match else None
 
-    # Pattern 4: youtube.com/shorts/VIDEO_ID or /live/VIDEO_ID
-    match = re.search(r'(?:shorts|live)\/([a-zA-Z0-9_\-]{11})(?:[?&#]|$)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
 
-    # Pattern 5: youtube-nocookie.com/embed/VIDEO_ID
-    match = re.search(r'youtube-nocookie\.com\/embed\/([a-zA-Z0-9_\-]{11})(?:[?&#]|$)', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+def _lowercase_same_length(text: str) -> str:
+    """
+    Lowercase text so that every character keeps its index.
 
-    # Pattern 6: attribution_link with encoded watch URL
-    match = re.search(r'attribution_link\?.*u=(?:\/|%2F)watch(?:\?|%3F)v(?:=|%3D)([a-zA-Z0-9_\-]{11})', url, re.IGNORECASE)
-    if match:
-        return match.group(1)
+    Positions found in the result can be used to slice the original, which
+    keeps the case of the video ID.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few non-ASCII characters lowercase to two; fold only ASCII
+        lowered = ''.join(c.lower() if c.isascii() else c for c in text)
+    return lowered
+
+
+def _is_video_id(candidate: str) -> bool:
+    """Check that candidate is exactly 11 video ID characters."""
+    return len(candidate) == 11 and _VIDEO_ID_CHARS.issuperset(candidate)
+
+
+def _fast_video_id(url: str, lowered: str) -> Optional[str]:
+    """
+    Find the video ID in youtu.be/ID and ?v=ID URLs using plain string search.
+
+    Mirrors the first two branches of _VIDEO_ID_RE.
+
+    Args:
+        url: Stripped URL string
+        lowered: url lowercased by _lowercase_same_length()
+
+    Returns:
+        The video ID, or None to fall back to the full pattern
+    """
+    start = lowered.find('youtu.be/')
+    if start >= 0:
+        candidate = url[start + 9:start + 20]
+        return candidate if _is_video_id(candidate) else None
+
+    starts = [i for i in (lowered.find('?v='), lowered.find('&v=')) if i >= 0]
+    if starts:
+        start = min(starts) + 3
+        candidate = url[start:start + 11]
+        if _is_video_id(candidate) and url[start + 11:start + 12] in ('', '&', '#'):
+            return candidate
 
     return None
 
 
+@functools.lru_cache(maxsize=4)
+def _which_ytdlp(path_env: Optional[str]) -> Optional[str]:
+    """
+    Locate yt-dlp on PATH, scanning each PATH value only once.
+
+    Args:
+        path_env: Current PATH value; only used as the cache key so a
+                  changed PATH triggers a fresh lookup
+
+    Returns:
+        Full path to yt-dlp, or None if it is not installed
+    """
+    import shutil
+
+    return shutil.which('yt-dlp')
+
+
 def check_ytdlp_installed() -> Tuple[bool, str]:
     """
     Check if yt-dlp is installed and available in PATH.
@@ -117,7 +326,7 @@ def check_ytdlp_installed() -> Tuple[bool, str]:
         - is_installed: True if yt-dlp is found, False otherwise
         - message: Descriptive message about the status
     """
-    ytdlp_path = shutil.which('yt-dlp')
+    ytdlp_path = _which_ytdlp(os.environ.get('PATH'))
 
     if ytdlp_path:
         return True, f"yt-dlp found at: {ytdlp_path}"
@@ -132,6 +341,8 @@ def get_ytdlp_version() -> Optional[str]:
     Returns:
         Version string, or None if it cannot be determined
     """
+    import subprocess
+
     try:
         result = subprocess.run(
             ['yt-dlp', '--version'],
@@ -160,12 +371,14 @@ def ytdlp_age_days(version: Optional[str] = None) -> Optional[int]:
     Returns:
         Age in days, or None if the version cannot be determined/parsed
     """
+    from datetime import datetime
+
     if version is None:
         version = get_ytdlp_version()
     if not version:
         return None
 
-    match = re.match(r'^(\d{4})\.(\d{1,2})\.(\d{1,2})', version)
+    match = _YTDLP_VERSION_RE.match(version)
     if not match:
         return None
 
@@ -241,9 +454,13 @@ def _build_base_cmd(player_client: Optional[str] = None) -> List[str]:
     elif cookies_browser:
         cmd += ['--cookies-from-browser', cookies_browser]
 
+    # Never fetch the DASH/HLS manifests: they only list media formats,
+    # and clipdrop downloads captions and metadata, never media
+    extractor_args = ['skip=dash,hls']
     client = player_client or os.environ.get(ENV_PLAYER_CLIENT)
     if client:
-        cmd += ['--extractor-args', f'youtube:player_client={client}']
+        extractor_args.append(f'player_client={client}')
+    cmd += ['--extractor-args', 'youtube:' + ';'.join(extractor_args)]
 
     return cmd
 
@@ -252,7 +469,8 @@ def _run_ytdlp(
     args: List[str],
     timeout: int = 30,
     max_attempts: int = MAX_ATTEMPTS,
-) -> subprocess.CompletedProcess:
+    capture_stdout: bool = True,
+) -> "subprocess.CompletedProcess":
     """
     Run yt-dlp with retries, backoff, and blocking-error detection.
 
@@ -265,10 +483,14 @@ def _run_ytdlp(
         args: Command arguments to append to the base command
         timeout: Per-attempt timeout in seconds
         max_attempts: Maximum number of attempts for transient failures
+        capture_stdout: Whether the caller needs stdout; when False it is
+            discarded instead of buffered (stderr is always captured for
+            error classification)
 
     Returns:
         CompletedProcess for a successful run, or the final failed run
-        whose error was not recognized (caller reports it)
+        whose error was not recognized (caller reports it). stdout is
+        bytes; stderr is decoded to str.
 
     Raises:
         YTDLPNotFoundError: If yt-dlp is not installed
@@ -282,6 +504,7 @@ def _run_ytdlp(
         YouTubeBotCheckError,
         YouTubeRateLimitError,
     )
+    import subprocess
 
     user_set_client = bool(os.environ.get(ENV_PLAYER_CLIENT))
     player_client = None
@@ -296,8 +519,9 @@ def _run_ytdlp(
         try:
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=timeout
             )
         except FileNotFoundError:
@@ -312,6 +536,11 @@ def _run_ytdlp(
                 "or YouTube may be throttling this connection)"
             )
 
+        # stdout stays as bytes for the JSON parser; stderr is only ever
+        # read as text, so decode it once here
+        if isinstance(result.stderr, bytes):
+            result.stderr = result.stderr.decode('utf-8', errors='replace')
+
         if result.returncode == 0:
             return result
 
@@ -361,6 +590,11 @@ def _fetch_metadata(url: str, cache_dir: Optional[str] = None) -> Dict[str, Any]
     """
     Fetch video metadata and caption listings in a single yt-dlp call.
 
+    When yt-dlp is importable the extraction runs in this process, which
+    skips starting a second interpreter and re-importing yt-dlp. The
+    yt-dlp command is the fallback when the library itself fails; errors
+    reported by YouTube are raised from either path alike.
+
     Video info and available captions come from the same underlying
     player request, so fetching them together (and caching the result)
     means one network round-trip per video instead of two — halving the
@@ -380,58 +614,49 @@ def _fetch_metadata(url: str, cache_dir: Optional[str] = None) -> Dict[str, Any]
         YouTubeRateLimitError: If rate-limited
         YouTubeError: For other errors
     """
-    from .exceptions import YTDLPNotFoundError, YouTubeURLError, YouTubeError
+    from .exceptions import YTDLPNotFoundError, YouTubeURLError
 
-    if not validate_youtube_url(url):
-        raise YouTubeURLError(url)
-
-    video_id = extract_video_id(url)
+    video_id = parse_youtube_url(url)
     if not video_id:
         raise YouTubeURLError(url)
 
-    is_installed, _ = check_ytdlp_installed()
-    if not is_installed:
-        raise YTDLPNotFoundError()
+    # Already fetched or loaded during this run
+    memo_key = (video_id, cache_dir)
+    if memo_key in _METADATA_MEMO:
+        return _METADATA_MEMO[memo_key]
 
     video_cache_dir = get_cache_dir(video_id, cache_dir)
-    ensure_cache_dir(video_cache_dir)
     metadata_path = video_cache_dir / "metadata.json"
 
-    # Serve from cache when fresh
-    if metadata_path.exists():
+    # Serve from cache when fresh, before any yt-dlp or directory setup.
+    # Freshness comes from the file's mtime, so a stale file is never read.
+    try:
+        age = time.time() - metadata_path.stat().st_mtime
+    except OSError:
+        age = None  # Not cached yet
+    if age is not None and age < METADATA_CACHE_DAYS * 86400:
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                cached = json.load(f)
-            if 'cached_at' in cached:
-                cached_time = datetime.fromisoformat(cached['cached_at'])
-                if (datetime.now() - cached_time).days < METADATA_CACHE_DAYS:
-                    return cached
+            with open(metadata_path, 'rb') as f:
+                cached = fastjson.loads(f.read())
+            if isinstance(cached, dict):
+                _remember_metadata(memo_key, cached)
+                return cached
         except (json.JSONDecodeError, ValueError, OSError):
             pass  # Invalid cache, re-fetch
 
-    # --ignore-no-formats-error: captions are often still extractable when
-    # YouTube blocks the media formats themselves; don't fail the whole
-    # request over formats we never download.
-    args = [
-        '--skip-download',
-        '--ignore-no-formats-error',
-        '-J',
-        url,
-    ]
+    api_available = _ytdlp_api() is not None
+    if not api_available:
+        is_installed, _ = check_ytdlp_installed()
+        if not is_installed:
+            raise YTDLPNotFoundError()
 
-    result = _run_ytdlp(args, timeout=45)
+    ensure_cache_dir(video_cache_dir)
 
-    if result.returncode != 0:
-        error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-        raise YouTubeError(f"Failed to fetch video info: {error_msg}")
+    data = _extract_metadata_inprocess(url) if api_available else None
+    if data is None:
+        data = _extract_metadata_subprocess(url)
 
-    try:
-        data = json.loads(result.stdout)
-    except json.JSONDecodeError as e:
-        raise YouTubeError(f"Failed to parse video information: {str(e)}")
-
-    if not isinstance(data, dict):
-        raise YouTubeError("Unexpected video information format")
+    from datetime import datetime
 
     metadata = {
         'title': data.get('title') or 'Unknown Title',
@@ -446,19 +671,266 @@ def _fetch_metadata(url: str, cache_dir: Optional[str] = None) -> Dict[str, Any]
         'subtitles': _trim_caption_map(data.get('subtitles')),
         'automatic_captions': _trim_caption_map(data.get('automatic_captions')),
         'url': url,
+        # Informational only; freshness is judged by the file's mtime
         'cached_at': datetime.now().isoformat()
     }
 
     try:
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(metadata_path, 'wb') as f:
+            f.write(fastjson.dumps_pretty(metadata))
     except OSError:
         pass  # Cache write failure shouldn't fail the request
 
+    _remember_metadata(memo_key, metadata)
     return metadata
 
 
-def list_captions(url: str, cache_dir: Optional[str] = None) -> List[Tuple[str, str, bool]]:
+class _SilentLogger:
+    """yt-dlp logger that discards output; errors surface as exceptions."""
+
+    def debug(self, msg: str) -> None:
+        pass
+
+    info = warning = error = debug
+
+
+@functools.lru_cache(maxsize=1)
+def _ytdlp_api():
+    """
+    Import yt-dlp as a library, once.
+
+    Returns:
+        The yt_dlp module, or None if it is not importable here (e.g. yt-dlp
+        was installed as a standalone binary)
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    return yt_dlp
+
+
+@functools.lru_cache(maxsize=4)
+def _ytdlp_client(argv: Tuple[str, ...]):
+    """
+    Build a reusable YoutubeDL instance for the given command-line options.
+
+    The options are parsed by yt-dlp itself, so the in-process client
+    behaves exactly like the equivalent yt-dlp command.
+
+    Args:
+        argv: yt-dlp arguments, without the program name
+
+    Returns:
+        A YoutubeDL instance
+    """
+    yt_dlp = _ytdlp_api()
+    options = yt_dlp.parse_options(list(argv)).ydl_opts
+    return yt_dlp.YoutubeDL({**options, 'logger': _SilentLogger()})
+
+
+# Returned by _call_with_timeout when the call is still running
+_TIMED_OUT: Any = object()
+
+
+def _call_with_timeout(func, timeout: float, *args, **kwargs) -> Any:
+    """
+    Call func in a daemon thread and wait at most timeout seconds for it.
+
+    A call that overruns is abandoned, not stopped; the socket timeout in
+    the yt-dlp options still bounds how long it can keep running.
+
+    Returns:
+        func's result, or _TIMED_OUT if it did not finish in time
+
+    Raises:
+        Whatever func raised
+    """
+    outcome: Dict[str, Any] = {}
+
+    def target() -> None:
+        try:
+            outcome['value'] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return _TIMED_OUT
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
+
+def _extract_metadata_inprocess(
+    url: str,
+    timeout: float = 45,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract video metadata with the yt-dlp library.
+
+    Follows the same retry policy as _run_ytdlp: timeouts and HTTP 429 are
+    retried with exponential backoff, and a bot check is retried once with
+    the fallback player client. Failures reported by YouTube raise the same
+    errors as the command path, so they cost no extra extraction by command.
+
+    Args:
+        url: The YouTube URL
+        timeout: Per-attempt timeout in seconds
+        max_attempts: Maximum number of attempts for transient failures
+
+    Returns:
+        The _METADATA_FIELDS present in the video info, or None if the
+        library itself failed (options rejected, unexpected API or internal
+        error) and the yt-dlp command should be used instead
+
+    Raises:
+        YouTubeBotCheckError: If YouTube demands bot verification
+        YouTubeRateLimitError: If rate-limited after all retries
+        YouTubeError: If every attempt times out, or for other extraction errors
+    """
+    from .exceptions import YouTubeError, YouTubeBotCheckError, YouTubeRateLimitError
+
+    yt_dlp = _ytdlp_api()
+    user_set_client = bool(os.environ.get(ENV_PLAYER_CLIENT))
+    player_client = None
+    tried_fallback_client = False
+    delay = RETRY_BASE_DELAY
+
+    attempt = 0
+    while True:
+        attempt += 1
+        argv = _build_base_cmd(player_client)[1:] + ['--skip-download', '--ignore-no-formats-error']
+        try:
+            client = _ytdlp_client(tuple(argv))
+            info = _call_with_timeout(client.extract_info, timeout, url, download=False)
+        except yt_dlp.utils.DownloadError as e:
+            error_msg = str(e).strip() or "Unknown error"
+            error = _classify_ytdlp_error(error_msg)
+
+            if isinstance(error, YouTubeRateLimitError) and attempt < max_attempts:
+                time.sleep(delay)
+                delay *= 2
+                continue
+
+            if (
+                isinstance(error, YouTubeBotCheckError)
+                and not tried_fallback_client
+                and not user_set_client
+            ):
+                tried_fallback_client = True
+                player_client = FALLBACK_PLAYER_CLIENT
+                continue
+
+            raise error or YouTubeError(f"Failed to fetch video info: {error_msg}") from e
+        except (Exception, SystemExit):
+            # parse_options exits on options this yt-dlp version rejects;
+            # anything else here is a library bug. The command still works.
+            return None
+
+        if info is _TIMED_OUT:
+            # The abandoned call may still be using its client; build a
+            # fresh one for the next attempt
+            _ytdlp_client.cache_clear()
+            if attempt < max_attempts:
+                time.sleep(delay)
+                delay *= 2
+                continue
+            raise YouTubeError(
+                "Timeout while contacting YouTube (network may be slow "
+                "or YouTube may be throttling this connection)"
+            )
+        break
+
+    if not isinstance(info, dict):
+        return None
+    return {field: info[field] for field in _METADATA_FIELDS if field in info}
+
+
+def _extract_metadata_subprocess(url: str) -> Dict[str, Any]:
+    """
+    Extract video metadata by running the yt-dlp command.
+
+    yt-dlp prints one JSON object restricted to _METADATA_FIELDS, so the
+    call spawns one process, makes one request and needs one JSON parse.
+
+    Args:
+        url: The YouTube URL
+
+    Returns:
+        The decoded metadata object
+
+    Raises:
+        YTDLPNotFoundError: If yt-dlp is not installed
+        YouTubeBotCheckError: If YouTube demands bot verification
+        YouTubeRateLimitError: If rate-limited
+        YouTubeError: For other errors
+    """
+    from .exceptions import YouTubeError
+
+    # --ignore-no-formats-error: captions are often still extractable when
+    # YouTube blocks the media formats themselves; don't fail the whole
+    # request over formats we never download.
+    args = [
+        '--skip-download',
+        '--ignore-no-formats-error',
+        '--print', _METADATA_TEMPLATE,
+        url,
+    ]
+
+    result = _run_ytdlp(args, timeout=45)
+
+    if result.returncode != 0:
+        error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+        raise YouTubeError(f"Failed to fetch video info: {error_msg}")
+
+    try:
+        data = fastjson.loads(result.stdout)
+    except json.JSONDecodeError as e:
+        raise YouTubeError(f"Failed to parse video information: {str(e)}")
+
+    if not isinstance(data, dict):
+        raise YouTubeError("Unexpected video information format")
+    return data
+
+
+def _remember_metadata(key: Tuple[str, Optional[str]], metadata: Dict[str, Any]) -> None:
+    """
+    Keep metadata in memory for the rest of the run, evicting the oldest entry.
+
+    Args:
+        key: (video_id, cache_dir) the metadata was fetched for
+        metadata: Metadata dictionary to remember
+    """
+    if len(_METADATA_MEMO) >= _METADATA_MEMO_SIZE:
+        _METADATA_MEMO.pop(next(iter(_METADATA_MEMO)))
+    _METADATA_MEMO[key] = metadata
+
+
+class CaptionTrack(NamedTuple):
+    """
+    A caption track available for a video.
+
+    Still a plain (lang_code, name, is_auto) tuple, so it unpacks and
+    compares like one.
+    """
+
+    lang_code: str
+    name: str
+    is_auto: bool
+
+
+def _track_name(lang_code: str, formats: Any) -> str:
+    """Display name of a caption track, falling back to its language code."""
+    if formats and isinstance(formats, list):
+        return formats[0].get('name', lang_code)
+    return lang_code
+
+
+def list_captions(url: str, cache_dir: Optional[str] = None) -> List[CaptionTrack]:
     """
     List available captions for a YouTube video.
 
@@ -467,7 +939,7 @@ def list_captions(url: str, cache_dir: Optional[str] = None) -> List[Tuple[str,
         cache_dir: Optional cache directory path
 
     Returns:
-        List of tuples: (lang_code, name, is_auto_generated)
+        List of CaptionTrack tuples: (lang_code, name, is_auto_generated)
         Example: [('en', 'English', False), ('es', 'Spanish (auto-generated)', True)]
 
     Raises:
@@ -485,34 +957,28 @@ def list_captions(url: str, cache_dir: Optional[str] = None) -> List[Tuple[str,
     manual_subs = metadata.get('subtitles') or {}
     auto_subs = metadata.get('automatic_captions') or {}
 
-    captions = []
-
-    # Process manual subtitles
-    for lang_code, formats in manual_subs.items():
-        if formats and isinstance(formats, list) and len(formats) > 0:
-            name = formats[0].get('name', lang_code)
-        else:
-            name = lang_code
-        captions.append((lang_code, name, False))
-
-    # Process auto-generated captions
+    # Manual subtitles first, then auto-generated captions for languages
+    # that have no manual track
+    captions = [
+        CaptionTrack(lang_code, _track_name(lang_code, formats), False)
+        for lang_code, formats in manual_subs.items()
+    ]
     for lang_code, formats in auto_subs.items():
-        # Skip if we already have manual subs for this language
-        if lang_code not in manual_subs:
-            if formats and isinstance(formats, list) and len(formats) > 0:
-                name = formats[0].get('name', lang_code)
-                # Add (auto-generated) to the name if not already present
-                if '(auto-generated)' not in name.lower():
-                    name = f"{name} (auto-generated)"
-            else:
-                name = f"{lang_code} (auto-generated)"
-            captions.append((lang_code, name, True))
+        if lang_code in manual_subs:
+            continue
+        name = _track_name(lang_code, formats)
+        # Add (auto-generated) to the name if not already present; names
+        # without a '(' can't contain it, so skip the lowercase copy
+        if '(' not in name or '(auto-generated)' not in name.lower():
+            name = f"{name} (auto-generated)"
+        captions.append(CaptionTrack(lang_code, name, True))
 
     if not captions:
-        raise NoCaptionsError(extract_video_id(url))
+        # The metadata already carries the ID parsed from the URL
+        raise NoCaptionsError(metadata.get('id') or parse_youtube_url(url))
 
     # Sort by language code for consistency
-    captions.sort(key=lambda x: x[0])
+    captions.sort(key=itemgetter(0))
 
     return captions
 
@@ -542,53 +1008,47 @@ def select_caption_track(
     if not captions:
         return None
 
-    # If no preference specified, default to English
+    # If no preference specified, default to English (most common for tech
+    # content). One pass: a manual English track wins outright; otherwise
+    # remember the first auto-generated English and first manual tracks.
     if not preferred_lang:
-        # Try English first (most common for tech content)
+        auto_english = None
+        first_manual = None
         for caption in captions:
-            lang_code, name, is_auto = caption
-            if lang_code.lower().startswith('en'):
+            lang_code, _, is_auto = caption
+            if lang_code[:2].lower() == 'en':
                 # Prefer manual over auto-generated
                 if not is_auto:
                     return caption
+                if auto_english is None:
+                    auto_english = caption
+            elif not is_auto and first_manual is None:
+                first_manual = caption
 
-        # Try auto-generated English if no manual English found
-        for caption in captions:
-            lang_code, name, is_auto = caption
-            if lang_code.lower().startswith('en') and is_auto:
-                return caption
-
-        # No English found, try to find any manual caption
-        for caption in captions:
-            if not caption[2]:  # Not auto-generated
-                return caption
-
-        # Fall back to first caption
-        return captions[0]
+        # Then auto-generated English, any manual caption, the first caption
+        return auto_english or first_manual or captions[0]
 
     # Normalize the preferred language (lowercase, strip whitespace)
     preferred_lang = preferred_lang.lower().strip()
 
-    # Extract base language code (e.g., 'en' from 'en-US')
+    # Extract base language code (e.g., 'en' from 'en-US'); codes with that
+    # base are the base itself or start with base + '-'
     preferred_base = preferred_lang.split('-')[0]
+    preferred_variant = preferred_base + '-'
 
-    # Score each caption
-    scored_captions = []
+    # Score each caption in one pass (higher is better); the first caption
+    # with the best score wins, and a manual exact match can't be beaten
+    best = None
+    best_score = -1
     for caption in captions:
-        lang_code, name, is_auto = caption
+        lang_code, _, is_auto = caption
         normalized_code = lang_code.lower()
-        base_code = normalized_code.split('-')[0]
-
-        # Calculate score (higher is better)
-        score = 0
 
-        # Exact match
+        # Exact match, then base language match (en matches en-US)
         if normalized_code == preferred_lang:
             score = 100
-        # Base language match (en matches en-US)
-        elif base_code == preferred_base:
+        elif normalized_code == preferred_base or normalized_code.startswith(preferred_variant):
             score = 50
-        # No match
         else:
             score = 1
 
@@ -596,13 +1056,12 @@ def select_caption_track(
         if not is_auto:
             score += 10
 
-        scored_captions.append((score, caption))
+        if score > best_score:
+            best, best_score = caption, score
+            if score == _BEST_CAPTION_SCORE:
+                break
 
-    # Sort by score (highest first)
-    scored_captions.sort(key=lambda x: x[0], reverse=True)
-
-    # Return the best match
-    return scored_captions[0][1] if scored_captions else None
+    return best
 
 
 def get_cache_dir(video_id: str, base_cache_dir: Optional[str] = None) -> Path:
@@ -620,11 +1079,22 @@ def get_cache_dir(video_id: str, base_cache_dir: Optional[str] = None) -> Path:
         base_path = Path(base_cache_dir)
     else:
         # Default cache location
-        base_path = Path.home() / ".cache" / "clipdrop" / "youtube"
+        base_path = _default_cache_base(os.environ.get(_HOME_ENV))
 
     return base_path / video_id
 
 
+@functools.lru_cache(maxsize=4)
+def _default_cache_base(home_env: Optional[str]) -> Path:
+    """
+    Build ~/.cache/clipdrop/youtube once per home directory.
+
+    Keyed on the variable Path.home() reads, so a changed home directory
+    (as in tests) still gets its own path.
+    """
+    return Path.home() / ".cache" / "clipdrop" / "youtube"
+
+
 def ensure_cache_dir(cache_dir: Path) -> None:
     """
     Ensure cache directory exists, create if necessary.
@@ -632,7 +1102,15 @@ def ensure_cache_dir(cache_dir: Path) -> None:
     Args:
         cache_dir: Path to the cache directory
     """
-    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Each directory is checked at most once per process
+    if cache_dir in _ENSURED_DIRS:
+        return
+
+    # After the first run the directory almost always exists; one stat
+    # answers that without a failing mkdir for each missing parent
+    if not cache_dir.is_dir():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(cache_dir)
 
 
 def sanitize_filename(title: str) -> str:
@@ -646,9 +1124,7 @@ def sanitize_filename(title: str) -> str:
         Sanitized filename-safe string
     """
     # Replace problematic characters with underscore
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        title = title.replace(char, '_')
+    title = title.translate(_TITLE_SANITIZE_TABLE)
 
     # Remove leading/trailing spaces and dots
     title = title.strip(' .')
@@ -686,29 +1162,27 @@ def download_vtt(
     from .exceptions import YTDLPNotFoundError, YouTubeURLError, NoCaptionsError, YouTubeError
 
     # Validate URL and get video ID
-    if not validate_youtube_url(url):
-        raise YouTubeURLError(url)
-
-    video_id = extract_video_id(url)
+    video_id = parse_youtube_url(url)
     if not video_id:
         raise YouTubeURLError(url)
 
+    # Check if VTT already exists in cache; a hit needs neither yt-dlp
+    # nor the directory setup below
+    video_cache_dir = get_cache_dir(video_id, cache_dir)
+    vtt_filename = f"{video_id}.{lang_code}.vtt"
+    vtt_path = video_cache_dir / vtt_filename
+
+    if vtt_path.exists():
+        return str(vtt_path)
+
     # Check if yt-dlp is installed
     is_installed, _ = check_ytdlp_installed()
     if not is_installed:
         raise YTDLPNotFoundError()
 
     # Set up cache directory
-    video_cache_dir = get_cache_dir(video_id, cache_dir)
     ensure_cache_dir(video_cache_dir)
 
-    # Check if VTT already exists in cache
-    vtt_filename = f"{video_id}.{lang_code}.vtt"
-    vtt_path = video_cache_dir / vtt_filename
-
-    if vtt_path.exists():
-        return str(vtt_path)
-
     # Download VTT using yt-dlp
     output_template = str(video_cache_dir / f"{video_id}.%(lang)s.%(ext)s")
 
@@ -722,7 +1196,8 @@ def download_vtt(
         url
     ]
 
-    result = _run_ytdlp(args, timeout=60)
+    # Subtitles go to files; nothing useful is printed on stdout
+    result = _run_ytdlp(args, timeout=60, capture_stdout=False)
 
     if result.returncode != 0:
         error_msg = result.stderr.strip() if result.stderr else "Unknown error"
@@ -735,24 +1210,22 @@ def download_vtt(
 
     # Check if file was created
     if not vtt_path.exists():
-        # Try with just the language code (without region)
-        alt_vtt_path = video_cache_dir / f"{video_id}.{lang_code.split('-')[0]}.vtt"
-        if alt_vtt_path.exists():
-            # Rename to expected name
-            alt_vtt_path.rename(vtt_path)
+        # yt-dlp may have named it after the language code without region,
+        # with an NA prefix, or both. Rename the first that exists to the
+        # expected name; a failed rename doubles as the existence check.
+        short_code = lang_code.split('-')[0]
+        for alt_filename in (
+            f"{video_id}.{short_code}.vtt",
+            f"{video_id}.NA.{lang_code}.vtt",
+            f"{video_id}.NA.{short_code}.vtt",
+        ):
+            try:
+                (video_cache_dir / alt_filename).rename(vtt_path)
+                break
+            except FileNotFoundError:
+                continue
         else:
-            # Try with NA prefix (yt-dlp sometimes adds this)
-            na_vtt_path = video_cache_dir / f"{video_id}.NA.{lang_code}.vtt"
-            if na_vtt_path.exists():
-                # Rename to expected name
-                na_vtt_path.rename(vtt_path)
-            else:
-                # Try with NA and short lang code
-                na_short_vtt_path = video_cache_dir / f"{video_id}.NA.{lang_code.split('-')[0]}.vtt"
-                if na_short_vtt_path.exists():
-                    na_short_vtt_path.rename(vtt_path)
-                else:
-                    raise NoCaptionsError(f"No captions downloaded for language: {lang_code}")
+            raise NoCaptionsError(f"No captions downloaded for language: {lang_code}")
 
     return str(vtt_path)
 
@@ -822,9 +1295,7 @@ def parse_vtt(vtt_content: str) -> List[Dict[str, Any]]:
             continue
 
         # Check if this is a timestamp line or cue identifier
-        # Pattern handles both HH:MM:SS.mmm and MM:SS.mmm formats
-        timestamp_pattern = r'(\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3})\s*-->\s*(\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3})'
-        timestamp_match = re.search(timestamp_pattern, line)
+        timestamp_match = _VTT_TIMESTAMP_RE.search(line)
 
         if timestamp_match:
             # Found timestamp directly
@@ -834,7 +1305,7 @@ def parse_vtt(vtt_content: str) -> List[Dict[str, Any]]:
             # Collect subtitle text
             i += 1
             text_lines = []
-            while i < len(lines) and lines[i].strip() and not re.search(timestamp_pattern, lines[i]):
+            while i < len(lines) and lines[i].strip() and not _VTT_TIMESTAMP_RE.search(lines[i]):
                 text_lines.append(lines[i].strip())
                 i += 1
 
@@ -847,7 +1318,7 @@ def parse_vtt(vtt_content: str) -> List[Dict[str, Any]]:
             # This might be a cue identifier, check next line for timestamp
             if i + 1 < len(lines):
                 next_line = lines[i + 1].strip()
-                timestamp_match = re.search(timestamp_pattern, next_line)
+                timestamp_match = _VTT_TIMESTAMP_RE.search(next_line)
                 if timestamp_match:
                     # Skip cue identifier and move to timestamp line
                     start_time = timestamp_match.group(1).replace(',', '.')
@@ -856,7 +1327,7 @@ def parse_vtt(vtt_content: str) -> List[Dict[str, Any]]:
                     # Collect subtitle text (starting from line after timestamp)
                     i += 2
                     text_lines = []
-                    while i < len(lines) and lines[i].strip() and not re.search(timestamp_pattern, lines[i]):
+                    while i < len(lines) and lines[i].strip() and not _VTT_TIMESTAMP_RE.search(lines[i]):
                         text_lines.append(lines[i].strip())
                         i += 1
 
@@ -918,9 +1389,9 @@ def vtt_to_srt(vtt_content: str) -> str:
         # Add text (clean up any HTML tags)
         text = cue['text']
         # Remove common HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _VTT_TAG_RE.sub('', text)
         # Remove VTT positioning tags
-        text = re.sub(r'\{.*?\}', '', text)
+        text = _VTT_POSITION_RE.sub('', text)
 
         srt_lines.append(text)
 
@@ -963,9 +1434,9 @@ def vtt_to_txt(vtt_content: str, preserve_paragraphs: bool = True) -> str:
         # Clean up text
         text = cue['text']
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _VTT_TAG_RE.sub('', text)
         # Remove VTT formatting
-        text = re.sub(r'\{.*?\}', '', text)
+        text = _VTT_POSITION_RE.sub('', text)
         # Clean up extra whitespace
         text = ' '.join(text.split())
 
@@ -1047,9 +1518,9 @@ def vtt_to_md(vtt_content: str, include_timestamps: bool = True) -> str:
             # Clean and add text
             text = cue['text']
             # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', text)
+            text = _VTT_TAG_RE.sub('', text)
             # Remove VTT formatting
-            text = re.sub(r'\{.*?\}', '', text)
+            text = _VTT_POSITION_RE.sub('', text)
 
             # Preserve line breaks in multi-line subtitles
             if '\n' in text:
@@ -1072,9 +1543,9 @@ def vtt_to_md(vtt_content: str, include_timestamps: bool = True) -> str:
             # Clean up text
             text = cue['text']
             # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', text)
+            text = _VTT_TAG_RE.sub('', text)
             # Remove VTT formatting
-            text = re.sub(r'\{.*?\}', '', text)
+            text = _VTT_POSITION_RE.sub('', text)
             # Clean up extra whitespace
             text = ' '.join(text.split())
 
@@ -10,6 +10,14 @@ from PIL import Image
 import io
 
 
+@pytest.fixture(scope="session")
+def runner():
+    """CLI test runner shared by the whole session."""
+    from typer.testing import CliRunner
+
+    return CliRunner()
+
+
 @pytest.fixture
 def mock_clipboard():
     """Mock clipboard for testing without actual clipboard access."""
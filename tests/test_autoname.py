@@ -138,10 +138,10 @@ def mock_text_clipboard(monkeypatch):
     from clipdrop import main as clipdrop_main
 
     sample = "We met today to plan the quarterly roadmap and assign owners."
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "text")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "text")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: sample)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: None)
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
     return sample
 
 
@@ -168,10 +168,10 @@ def test_cli_auto_name_honors_extension(monkeypatch, mock_text_clipboard):
 def test_cli_auto_name_no_text_errors(monkeypatch):
     from clipdrop import main as clipdrop_main
 
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "image")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "image")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: None)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: object())
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
 
     with isolated_filesystem():
         result = runner.invoke(app, ["--auto-name"])
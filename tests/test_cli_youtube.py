@@ -1,96 +1,196 @@
 """Tests for YouTube CLI integration."""
 
-from unittest.mock import MagicMock, patch
-from typer.testing import CliRunner
-from clipdrop.main import app
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
 
+from clipdrop import youtube
+from clipdrop.main import app
 
-runner = CliRunner()
+# Canned video info and yt-dlp output, built once at import time
+_VIDEO_INFO = {
+    'title': 'Test Video',
+    'id': 'dQw4w9WgXcQ',
+    'uploader': 'TestUser',
+    'duration': 300,
+}
+_METADATA_NO_CAPTIONS = json.dumps({
+    **_VIDEO_INFO, 'subtitles': {}, 'automatic_captions': {},
+}).encode()
+_METADATA_EN_CAPTIONS = json.dumps({
+    **_VIDEO_INFO, 'subtitles': {'en': [{'name': 'English'}]}, 'automatic_captions': {},
+}).encode()
+_VTT_BLOB = "WEBVTT\n\n00:00:00.000 --> 00:00:05.000\nHello world\n"
+
+_YTDLP_UNEXPECTED = SimpleNamespace(returncode=1, stdout=b'', stderr=b'ERROR: unexpected call')
+
+
+def _metadata_result(stdout):
+    """Successful yt-dlp --print result."""
+    return SimpleNamespace(returncode=0, stdout=stdout, stderr=b'')
+
+
+def _write_vtt(cmd):
+    """Do what yt-dlp --write-sub does: save _VTT_BLOB at the -o template."""
+    template = cmd[cmd.index('-o') + 1]
+    lang = cmd[cmd.index('--sub-lang') + 1]
+    vtt_path = Path(template.replace('%(lang)s', lang).replace('%(ext)s', 'vtt'))
+    vtt_path.write_text(_VTT_BLOB, encoding='utf-8')
+    return SimpleNamespace(returncode=0, stdout=None, stderr=b'')
+
+
+@pytest.fixture(autouse=True)
+def ytdlp_via_subprocess(monkeypatch):
+    """Run yt-dlp through the command path, which these tests mock via subprocess.run."""
+    monkeypatch.setattr(youtube, '_ytdlp_api', lambda: None)
+    youtube._ytdlp_client.cache_clear()
+    yield
+    youtube._ytdlp_client.cache_clear()
+
+
+@pytest.fixture
+def fake_ytdlp(monkeypatch, tmp_path):
+    """
+    Route yt-dlp calls to canned results, with the cache under tmp_path.
+
+    Returns the dict mapping the flag that selects a yt-dlp action to its
+    result, or to a callable producing it; tests may replace entries.
+    """
+    results = {'--print': _metadata_result(_METADATA_NO_CAPTIONS), '--write-sub': _write_vtt}
+
+    def run(cmd, **kwargs):
+        for flag, result in results.items():
+            if flag in cmd:
+                return result(cmd) if callable(result) else result
+        return _YTDLP_UNEXPECTED
+
+    monkeypatch.setattr('subprocess.run', run)
+    monkeypatch.setattr(youtube, 'check_ytdlp_installed', lambda: (True, "yt-dlp found"))
+    monkeypatch.setattr(youtube, '_METADATA_MEMO', {})
+    monkeypatch.setenv('HOME', str(tmp_path))
+    return results
 
 
 class TestYouTubeCLIFlags:
     """Test YouTube CLI flag handling."""
 
     @patch('clipdrop.clipboard.get_text')
-    @patch('clipdrop.youtube.subprocess.run')
-    @patch('clipdrop.youtube.check_ytdlp_installed')
-    def test_youtube_flag_triggers_handler(self, mock_check, mock_run, mock_clipboard):
+    def test_youtube_flag_triggers_handler(self, mock_clipboard, fake_ytdlp, runner):
         """Test --youtube flag routes to handle_youtube_transcript."""
         mock_clipboard.return_value = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        mock_check.return_value = (True, "yt-dlp found")
-
-        # Mock yt-dlp responses
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = '"Test Video"\n"dQw4w9WgXcQ"\n"TestUser"\n300\n"20240101"\n"Description"\n1000\n50\nnull'
-        mock_run.return_value = mock_result
 
         result = runner.invoke(app, ["--youtube"])
+        out = result.stdout  # Result.stdout re-decodes on every access; read it once
 
-        assert "Found YouTube video: dQw4w9WgXcQ" in result.stdout
+        assert "Found YouTube video: dQw4w9WgXcQ" in out
+        assert "Title: Test Video" in out
         assert result.exit_code == 1  # Will fail on caption listing
 
+    @pytest.mark.parametrize("filename, expected", [
+        ("talk.srt", "1\n00:00:00,000 --> 00:00:05,000\nHello world"),
+        ("talk.vtt", _VTT_BLOB),
+        ("talk.txt", "Hello world"),
+        ("talk.md", "# Transcript\n\n**00:00:00 - 00:00:05**\nHello world"),
+    ])
     @patch('clipdrop.clipboard.get_text')
-    def test_yt_short_flag_works(self, mock_clipboard):
-        """Test -yt alias works."""
-        mock_clipboard.return_value = "not a youtube url"
+    def test_youtube_transcript_saved(
+        self, mock_clipboard, filename, expected, fake_ytdlp, tmp_path, monkeypatch, runner
+    ):
+        """Test the full flow: captions listed, VTT downloaded, file written."""
+        mock_clipboard.return_value = "https://youtu.be/dQw4w9WgXcQ"
+        fake_ytdlp['--print'] = _metadata_result(_METADATA_EN_CAPTIONS)
+        monkeypatch.chdir(tmp_path)
 
-        result = runner.invoke(app, ["-yt"])
+        result = runner.invoke(app, ["--youtube", filename])
 
-        assert "No YouTube URL in clipboard" in result.stdout
-        assert result.exit_code == 1
+        assert result.exit_code == 0, result.stdout
+        assert (tmp_path / filename).read_text(encoding="utf-8") == expected
 
 
-class TestYouTubeErrorMessages:
-    """Test YouTube error handling and messages."""
+    @patch('clipdrop.clipboard.get_text')
+    def test_youtube_metadata_fetched_in_process(
+        self, mock_clipboard, fake_ytdlp, tmp_path, monkeypatch, runner
+    ):
+        """Test the default path: metadata from the yt-dlp library, VTT via the command."""
+        extracted = []
 
-    def test_no_url_in_clipboard(self):
-        """Test error when clipboard is empty."""
-        with patch('clipdrop.clipboard.get_text', return_value=""):
-            result = runner.invoke(app, ["--youtube"])
+        class FakeYoutubeDL:
+            def __init__(self, params):
+                self.params = params
 
-            assert "Your clipboard is empty" in result.stdout
-            assert result.exit_code == 1
+            def extract_info(self, url, download=True):
+                extracted.append((url, download))
+                return {
+                    **_VIDEO_INFO,
+                    'subtitles': {'en': [{'name': 'English', 'url': 'https://example.com/en.vtt'}]},
+                    'automatic_captions': {},
+                    'formats': [{'format_id': '18'}],
+                }
 
-    def test_invalid_url_in_clipboard(self):
-        """Test error when clipboard has non-YouTube URL."""
-        with patch('clipdrop.clipboard.get_text', return_value="https://example.com"):
-            result = runner.invoke(app, ["--youtube"])
+        fake_module = SimpleNamespace(
+            parse_options=lambda argv: SimpleNamespace(ydl_opts={'quiet': True}),
+            YoutubeDL=FakeYoutubeDL,
+            utils=SimpleNamespace(DownloadError=type('DownloadError', (Exception,), {})),
+        )
+        monkeypatch.setattr(youtube, '_ytdlp_api', lambda: fake_module)
+        mock_clipboard.return_value = "https://youtu.be/dQw4w9WgXcQ"
+        fake_ytdlp['--print'] = lambda cmd: pytest.fail("metadata must not use the command")
+        monkeypatch.chdir(tmp_path)
 
-            assert "No YouTube URL in clipboard" in result.stdout
-            assert result.exit_code == 1
+        result = runner.invoke(app, ["--youtube", "talk.txt"])
 
-    @patch('clipdrop.clipboard.get_text')
-    @patch('clipdrop.main.validate_youtube_url')
-    @patch('clipdrop.main.extract_video_id')
-    @patch('clipdrop.main.get_video_info')
-    @patch('clipdrop.main.list_captions')
-    def test_no_captions_available(self, mock_list, mock_info, mock_extract, mock_validate, mock_clipboard):
-        """Test error when video has no captions."""
-        mock_clipboard.return_value = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        mock_validate.return_value = True
-        mock_extract.return_value = "dQw4w9WgXcQ"
+        assert result.exit_code == 0, result.stdout
+        assert extracted == [("https://youtu.be/dQw4w9WgXcQ", False)]
+        assert (tmp_path / "talk.txt").read_text(encoding="utf-8") == "Hello world"
 
-        mock_info.return_value = {
-            'title': 'Test Video',
-            'id': 'dQw4w9WgXcQ'
-        }
-        # Return empty caption list
-        mock_list.return_value = []
 
-        result = runner.invoke(app, ["--youtube"])
-
-        assert "No captions available" in result.stdout
-        assert result.exit_code == 1
+_WATCH_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
-    @patch('clipdrop.clipboard.get_text')
-    @patch('clipdrop.youtube.check_ytdlp_installed')
-    def test_ytdlp_not_installed(self, mock_check, mock_clipboard):
-        """Test error when yt-dlp is not installed."""
-        mock_clipboard.return_value = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
-        mock_check.return_value = (False, "yt-dlp not found")
 
-        result = runner.invoke(app, ["--youtube"])
+class TestYouTubeErrorMessages:
+    """Test YouTube error handling and messages."""
 
-        assert "yt-dlp is not installed" in result.stdout
-        assert result.exit_code == 1
\ No newline at end of file
+    @pytest.mark.parametrize("clipboard_text, patches, argv, expected", [
+        pytest.param("", {}, ["--youtube"], "Your clipboard is empty", id="empty-clipboard"),
+        pytest.param(
+            "https://example.com", {}, ["--youtube"], "No YouTube URL in clipboard",
+            id="not-youtube",
+        ),
+        pytest.param(
+            "not a youtube url", {}, ["-yt"], "No YouTube URL in clipboard",
+            id="short-flag",
+        ),
+        pytest.param(
+            _WATCH_URL,
+            {
+                'clipdrop.main.get_video_info': lambda url: _VIDEO_INFO,
+                'clipdrop.main.list_captions': lambda url: [],
+            },
+            ["--youtube"],
+            "No captions available",
+            id="no-captions",
+        ),
+        pytest.param(
+            _WATCH_URL,
+            {'clipdrop.youtube.check_ytdlp_installed': lambda: (False, "yt-dlp not found")},
+            ["--youtube"],
+            "yt-dlp is not installed",
+            id="ytdlp-missing",
+        ),
+    ])
+    def test_error_message(
+        self, clipboard_text, patches, argv, expected, monkeypatch, tmp_path, runner
+    ):
+        """Test each failure mode exits 1 with its explanation."""
+        monkeypatch.setattr('clipdrop.clipboard.get_text', lambda: clipboard_text)
+        monkeypatch.setenv('HOME', str(tmp_path))  # no real metadata cache
+        for target, value in patches.items():
+            monkeypatch.setattr(target, value)
+
+        result = runner.invoke(app, argv)
+
+        assert expected in result.stdout
+        assert result.exit_code == 1
@@ -89,6 +89,23 @@ class TestHasContent:
         with patch('pyperclip.paste', side_effect=Exception("Error")):
             assert clipboard.has_content() is False
 
+    def test_empty_clipboard_read_is_cached(self, mock_clipboard):
+        """Test repeated checks of an empty clipboard paste only once."""
+        mock_clipboard['set_content']("")
+
+        assert clipboard.has_content() is False
+        assert clipboard.get_content_preview() is None
+        assert mock_clipboard['paste'].call_count == 1
+
+        clipboard.clear_cache()
+        clipboard.has_content()
+        assert mock_clipboard['paste'].call_count == 2
+
+    def test_has_content_with_prefetched_text(self, mock_clipboard):
+        """Test that pre-fetched content skips the clipboard read."""
+        assert clipboard.has_content("already read") is True
+        mock_clipboard['paste'].assert_not_called()
+
 
 class TestGetContentType:
     """Tests for get_content_type function."""
@@ -166,6 +183,15 @@ class TestGetContentPreview:
         assert len(result) == 23  # 20 + "..."
         assert result.endswith("...")
 
+    def test_preview_uses_cached_text(self, mock_clipboard):
+        """Test preview slices the cached paste instead of re-reading."""
+        mock_clipboard['set_content']("cached " * 50)
+        clipboard.get_text()
+
+        result = clipboard.get_content_preview(10)
+        assert result == "cached cac..."
+        assert mock_clipboard['paste'].call_count == 1
+
 
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
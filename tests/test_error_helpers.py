@@ -0,0 +1,64 @@
+"""Tests for user-facing error message helpers."""
+
+from rich.console import Console
+
+from clipdrop import error_helpers
+
+
+def _capture(monkeypatch):
+    console = Console(record=True, width=100, color_system=None)
+    monkeypatch.setattr(error_helpers, "console", console)
+    return console
+
+
+def test_display_error_renders_message_and_suggestions(monkeypatch):
+    console = _capture(monkeypatch)
+
+    error_helpers.display_error('empty_clipboard')
+
+    output = console.export_text()
+    assert "📋 Nothing to save!" in output
+    assert "Your clipboard is empty." in output
+    assert "1. Copy some text with Cmd+C (Mac) or Ctrl+C" in output
+    assert "[bold red]" not in output
+
+
+def test_display_error_reuses_parsed_markup(monkeypatch):
+    _capture(monkeypatch)
+    error_helpers._cached_error.cache_clear()
+
+    error_helpers.display_error('file_exists')
+    error_helpers.display_error('file_exists')
+
+    info = error_helpers._cached_error.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_display_error_with_context_is_not_cached(monkeypatch):
+    console = _capture(monkeypatch)
+    error_helpers._cached_error.cache_clear()
+
+    error_helpers.display_error('permission_denied', {'filename': 'a.txt'})
+    error_helpers.display_error('permission_denied', {'filename': 'b.txt'})
+
+    output = console.export_text()
+    assert "(File: a.txt)" in output
+    assert "(File: b.txt)" in output
+    assert error_helpers._cached_error.cache_info().currsize == 0
+
+
+def test_display_error_keeps_highlighting(monkeypatch):
+    console = Console(record=True, width=100, color_system="truecolor")
+    monkeypatch.setattr(error_helpers, "console", console)
+    expected = Console(record=True, width=100, color_system="truecolor")
+
+    error_helpers.display_error('content_too_large')
+    info = error_helpers.get_error_message('content_too_large')
+    expected.print(f"\n{info['icon']} [bold red]{info['message']}[/bold red]")
+    expected.print(f"[yellow]{info['details']}[/yellow]\n")
+    expected.print("[bold cyan]💡 Try these solutions:[/bold cyan]")
+    for i, suggestion in enumerate(info['suggestions'], 1):
+        expected.print(f"  {i}. {suggestion}")
+    expected.print("")
+
+    assert console.export_text(styles=True) == expected.export_text(styles=True)
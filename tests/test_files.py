@@ -32,6 +32,24 @@ class TestCheckExists:
 
         assert files.check_exists(subdir) is False
 
+    def test_exists_below_a_file(self, temp_directory):
+        """Test a path whose parent is a regular file returns False."""
+        test_file = temp_directory / "test.txt"
+        test_file.write_text("content")
+
+        assert files.check_exists(test_file / "child.txt") is False
+
+    def test_exists_with_symlink_loop(self, temp_directory):
+        """Test a symlink loop returns False instead of raising."""
+        loop = temp_directory / "loop"
+        loop.symlink_to(loop)
+
+        assert files.check_exists(loop) is False
+
+    def test_exists_with_embedded_nul(self, temp_directory):
+        """Test a path containing a NUL byte returns False."""
+        assert files.check_exists(temp_directory / "bad\0name") is False
+
 
 class TestEnsureParentDir:
     """Tests for ensure_parent_dir function."""
@@ -132,6 +150,15 @@ class TestGetFileSize:
         result = files.get_file_size("")
         assert result == "0 B"
 
+    def test_precomputed_size(self):
+        """Test formatting an already-computed byte count."""
+        assert files.get_file_size(1536) == "1.5 KB"
+
+    def test_content_size_matches_utf8_length(self, sample_unicode):
+        """Test byte size for ASCII and non-ASCII content."""
+        assert files.get_content_size("Hello") == 5
+        assert files.get_content_size(sample_unicode) == len(sample_unicode.encode('utf-8'))
+
 
 class TestWriteText:
     """Tests for write_text function."""
@@ -195,6 +222,26 @@ class TestWriteText:
 
         assert test_file.read_text() == "New content"
 
+    def test_write_new_file_without_force_no_prompt(self, temp_directory, mock_confirm_prompt):
+        """Test that creating a new file never asks to overwrite."""
+        test_file = temp_directory / "fresh.txt"
+
+        files.write_text(test_file, "Fresh content", force=False)
+
+        assert test_file.read_text() == "Fresh content"
+        mock_confirm_prompt.assert_not_called()
+
+    def test_write_over_directory_never_prompts(self, temp_directory, mock_confirm_prompt):
+        """Test a directory at the target path is rejected without asking to overwrite."""
+        target = temp_directory / "taken.txt"
+        target.mkdir()
+
+        with pytest.raises(Exception, match="Failed to write file: .*is a directory"):
+            files.write_text(target, "content", force=False)
+
+        mock_confirm_prompt.assert_not_called()
+        assert target.is_dir()
+
     def test_write_empty_content_error(self, temp_directory):
         """Test that empty content raises an error."""
         test_file = temp_directory / "empty.txt"
@@ -217,6 +264,71 @@ class TestWriteText:
         parsed = json.loads(written_content)
         assert parsed["name"] == "ClipDrop Test"
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_write_json_backends_match(self, temp_directory, monkeypatch, use_orjson):
+        """Test JSON output is identical with and without orjson."""
+        from clipdrop import fastjson
+
+        if not use_orjson:
+            monkeypatch.setattr(fastjson, "orjson", None)
+        elif fastjson.orjson is None:
+            pytest.skip("orjson not installed")
+
+        json_file = temp_directory / "unicode.json"
+        files.write_text(json_file, '{"greeting": "héllo 世界", "n": [1, 2]}', force=True)
+
+        assert json_file.read_text(encoding="utf-8") == (
+            '{\n  "greeting": "héllo 世界",\n  "n": [\n    1,\n    2\n  ]\n}'
+        )
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_write_json_keeps_wide_integers(self, temp_directory, monkeypatch, use_orjson):
+        """Test integers wider than 64 bits are not rounded to floats."""
+        from clipdrop import fastjson
+
+        if not use_orjson:
+            monkeypatch.setattr(fastjson, "orjson", None)
+        elif fastjson.orjson is None:
+            pytest.skip("orjson not installed")
+
+        json_file = temp_directory / "wide.json"
+        files.write_text(json_file, '{"account": 123456789012345678901234567890}', force=True)
+
+        assert json_file.read_text(encoding="utf-8") == (
+            '{\n  "account": 123456789012345678901234567890\n}'
+        )
+        assert fastjson.loads(b'[-18446744073709551616]') == [-18446744073709551616]
+
+    def test_write_json_already_pretty_kept(self, temp_directory):
+        """Test already-indented JSON is written without reformatting."""
+        json_file = temp_directory / "pretty.json"
+        pretty = '{\n    "a": 1,\n    "b": [1,2]\n}'
+
+        files.write_text(json_file, pretty, force=True)
+
+        assert json_file.read_text() == pretty
+
+    def test_write_large_text_streamed_in_chunks(self, temp_directory, monkeypatch):
+        """Test large text encoded chunk by chunk round-trips exactly."""
+        monkeypatch.setattr(files, "WRITE_BUFFER_SIZE", 64)
+        monkeypatch.setattr(files, "WRITE_CHUNK_CHARS", 7)
+        text_file = temp_directory / "large.txt"
+        content = "héllo 世界 🌍\n" * 50
+
+        files.write_text(text_file, content, force=True)
+
+        assert text_file.read_bytes() == content.encode("utf-8")
+
+    def test_write_large_json_not_reformatted(self, temp_directory, monkeypatch):
+        """Test JSON above the size limit is written as-is."""
+        monkeypatch.setattr(files, "PRETTY_JSON_LIMIT", 16)
+        json_file = temp_directory / "large.json"
+        compact = '{"key": "value", "n": [1, 2, 3]}'
+
+        files.write_text(json_file, compact, force=True)
+
+        assert json_file.read_text() == compact
+
     def test_write_invalid_json_as_text(self, temp_directory):
         """Test writing invalid JSON to .json file."""
         json_file = temp_directory / "invalid.json"
@@ -245,11 +357,26 @@ class TestWriteText:
 
         assert Path(str_path).read_text() == content
 
+    @pytest.mark.parametrize("buffer_size, name, content", [
+        (64, "surrogate.txt", "bad \udcff bytes"),
+        (4, "surrogate.txt", "bad \udcff bytes"),
+        (64, "surrogate.json", '{"a": "\\ud800"}'),
+    ], ids=["small", "chunked", "json"])
+    def test_write_unencodable_text_error(self, temp_directory, monkeypatch, buffer_size, name, content):
+        """Test lone surrogates get the wrapped write error on every path."""
+        monkeypatch.setattr(files, "WRITE_BUFFER_SIZE", buffer_size)
+        test_file = temp_directory / name
+
+        with pytest.raises(Exception, match="Failed to write file") as exc_info:
+            files.write_text(test_file, content, force=True)
+
+        assert not isinstance(exc_info.value, UnicodeError)
+
     def test_write_permission_error(self, temp_directory):
         """Test handling write permission errors."""
         test_file = temp_directory / "test.txt"
 
-        with patch.object(Path, 'write_text', side_effect=PermissionError("No write permission")):
+        with patch('clipdrop.files.os.open', side_effect=PermissionError("No write permission")):
             with pytest.raises(PermissionError, match="Cannot write to"):
                 files.write_text(test_file, "content", force=True)
 
@@ -283,6 +410,13 @@ class TestValidateFilename:
         """Test detection of null bytes."""
         assert files.validate_filename("file\x00name.txt") is False
 
+    @pytest.mark.parametrize("char", list('/\\\0:*?"<>|'))
+    def test_every_invalid_character_rejected(self, char):
+        """Test each reserved character is rejected, including at the edges."""
+        assert files.validate_filename(f"file{char}name.txt") is False
+        assert files.validate_filename(f"{char}file.txt") is False
+        assert files.validate_filename(f"file.txt{char}") is False
+
 
 class TestSanitizeFilename:
     """Tests for sanitize_filename function."""
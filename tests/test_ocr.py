@@ -133,10 +133,10 @@ def mock_image_clipboard(monkeypatch):
     from clipdrop import main as clipdrop_main
 
     fake_image = object()
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "image")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "image")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: None)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: fake_image)
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
     return fake_image
 
 
@@ -153,7 +153,7 @@ def test_cli_ocr_saves_recognized_text(monkeypatch, mock_image_clipboard):
 def test_cli_ocr_no_image(monkeypatch):
     from clipdrop import main as clipdrop_main
 
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "text")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "text")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: "just text")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: None)
 
@@ -139,10 +139,10 @@ def mock_clipboard_for_summary(monkeypatch):
 
     sample = ("Sentence " * 80).strip()
 
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "text")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "text")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: sample)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: None)
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
     monkeypatch.setattr(
         clipdrop_main.clipboard,
         "get_content_preview",
@@ -0,0 +1,143 @@
+"""Tests for on-device audio transcription (Swift helper) integration."""
+
+import io
+import sys
+
+import pytest
+
+from clipdrop import macos_ai
+from clipdrop.macos_ai import _iter_jsonl_records, transcribe_from_clipboard
+
+
+class FakePopen:
+    """Minimal stand-in for subprocess.Popen with canned binary output."""
+
+    def __init__(self, stdout: bytes, stderr: bytes = b"", returncode: int = 0):
+        self.stdout = io.BytesIO(stdout)
+        self.stderr = io.BytesIO(stderr)
+        self.returncode = returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class SmallReads(io.RawIOBase):
+    """Binary stream that returns at most ``size`` bytes per read."""
+
+    def __init__(self, data: bytes, size: int):
+        self._data = data
+        self._size = size
+
+    def read(self, n=-1):
+        chunk, self._data = self._data[:self._size], self._data[self._size:]
+        return chunk
+
+
+@pytest.fixture(autouse=True)
+def clear_helper_path_cache():
+    """Keep a helper_path lookup cached by one test out of the next."""
+    macos_ai.helper_path.cache_clear()
+    yield
+    macos_ai.helper_path.cache_clear()
+
+
+@pytest.fixture
+def fake_helper(monkeypatch):
+    monkeypatch.setattr(macos_ai, "helper_path", lambda: "/fake/helper")
+
+    def install(**kwargs):
+        monkeypatch.setattr(
+            macos_ai.subprocess, "Popen", lambda *a, **kw: FakePopen(**kwargs)
+        )
+
+    return install
+
+
+@pytest.fixture
+def macos_26(monkeypatch, tmp_path):
+    """Pretend to run on macOS 26 with the helper installed under tmp_path."""
+    (tmp_path / "bin").mkdir()
+    helper = tmp_path / "bin" / "clipdrop-transcribe-clipboard"
+    helper.write_bytes(b"")
+    lookups = []
+
+    def fake_files(package):
+        lookups.append(package)
+        return tmp_path
+
+    monkeypatch.setattr(macos_ai.platform, "system", lambda: "Darwin")
+    monkeypatch.setattr(macos_ai, "get_macos_version", lambda: (26, 0))
+    monkeypatch.setattr(macos_ai, "files", fake_files)
+    return helper, lookups
+
+
+def test_helper_path_is_looked_up_once(macos_26):
+    helper, lookups = macos_26
+
+    assert macos_ai.helper_path() == str(helper)
+    assert macos_ai.helper_path() == str(helper)
+    assert len(lookups) == 1
+
+
+def test_helper_path_failure_is_not_cached(macos_26):
+    helper, lookups = macos_26
+    helper.unlink()
+
+    with pytest.raises(macos_ai.HelperNotFoundError):
+        macos_ai.helper_path()
+
+    helper.write_bytes(b"")
+    assert macos_ai.helper_path() == str(helper)
+    assert len(lookups) == 2
+
+
+def test_iter_jsonl_records_splits_across_chunks():
+    data = b'{"a": 1}\n\n{"b": 2}\n{"c": 3}'
+    records = list(_iter_jsonl_records(SmallReads(data, 3)))
+    assert records == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_transcribe_parses_segments(fake_helper):
+    fake_helper(stdout=(
+        '{"start": 0.0, "end": 1.5, "text": "Hello"}\n'
+        '{"start": 1.5, "end": 3.0, "text": "héllo wörld"}\n'
+    ).encode("utf-8"))
+
+    segments = transcribe_from_clipboard()
+
+    assert [s["text"] for s in segments] == ["Hello", "héllo wörld"]
+    assert segments[1]["end"] == 3.0
+
+
+def test_transcribe_parses_segments_without_orjson(fake_helper, monkeypatch):
+    from clipdrop import fastjson
+
+    monkeypatch.setattr(fastjson, "orjson", None)
+    fake_helper(stdout=b'{"start": 0.0, "end": 1.0, "text": "stdlib"}\n')
+
+    assert transcribe_from_clipboard() == [{"start": 0.0, "end": 1.0, "text": "stdlib"}]
+
+
+def test_transcribe_reports_helper_error(fake_helper):
+    fake_helper(stdout=b"", stderr=b"model unavailable\n", returncode=4)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        transcribe_from_clipboard()
+
+
+def test_transcribe_survives_large_stderr(monkeypatch, tmp_path):
+    """A helper that floods stderr before writing stdout must not deadlock."""
+    script = tmp_path / "helper"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stderr.write('x' * 256 * 1024)\n"
+        "sys.stderr.flush()\n"
+        "print('{\"start\": 0, \"end\": 1, \"text\": \"done\"}')\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setattr(macos_ai, "helper_path", lambda: str(script))
+
+    segments = transcribe_from_clipboard()
+
+    assert segments == [{"start": 0, "end": 1, "text": "done"}]
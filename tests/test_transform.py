@@ -151,10 +151,10 @@ def mock_text_clipboard(monkeypatch):
     from clipdrop import main as clipdrop_main
 
     sample = "Some prose copied to the clipboard for transformation."
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "text")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "text")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: sample)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: None)
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
     return sample
 
 
@@ -211,10 +211,10 @@ def test_cli_transform_mutually_exclusive(monkeypatch, mock_text_clipboard):
 def test_cli_transform_no_text(monkeypatch):
     from clipdrop import main as clipdrop_main
 
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda: "image")
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_content_type", lambda content=None: "image")
     monkeypatch.setattr(clipdrop_main.clipboard, "get_text", lambda: None)
     monkeypatch.setattr(clipdrop_main.clipboard, "get_image", lambda: object())
-    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda: None)
+    monkeypatch.setattr(clipdrop_main.clipboard, "get_image_info", lambda img=None: None)
 
     with isolated_filesystem():
         result = runner.invoke(app, ["x.txt", "--rewrite", "formal"])
@@ -1,13 +1,20 @@
 """Tests for YouTube URL handling and yt-dlp integration."""
 
 import json
+import os
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.clipdrop import youtube
 from src.clipdrop.youtube import (
     validate_youtube_url,
     extract_video_id,
+    parse_youtube_url,
     check_ytdlp_installed,
     list_captions,
     select_caption_track,
@@ -23,6 +30,28 @@ from src.clipdrop.youtube import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_youtube_caches(monkeypatch):
+    """Forget in-process caches so each test sees its own mocks."""
+    # Captured up front: a test may monkeypatch these names before teardown
+    caches = (
+        youtube._which_ytdlp,
+        youtube._ytdlp_client,
+        youtube.parse_youtube_url,
+        youtube.extract_video_id,
+    )
+    monkeypatch.setattr(youtube, "_ytdlp_api", lambda: None)
+    for cache in caches:
+        cache.cache_clear()
+    youtube._METADATA_MEMO.clear()
+    youtube._ENSURED_DIRS.clear()
+    yield
+    for cache in caches:
+        cache.cache_clear()
+    youtube._METADATA_MEMO.clear()
+    youtube._ENSURED_DIRS.clear()
+
+
 class TestYouTubeURLValidation:
     """Test YouTube URL validation functionality."""
 
@@ -48,14 +77,12 @@ class TestYouTubeURLValidation:
             "https://www.youtube.com/watch?time_continue=506&v=dQw4w9WgXcQ",
         ]
 
-        for url in valid_urls:
-            assert validate_youtube_url(url) is True, f"Failed to validate: {url}"
+        assert [url for url in valid_urls if validate_youtube_url(url) is not True] == []
 
     def test_invalid_youtube_urls(self):
         """Test that invalid URLs are rejected."""
         invalid_urls = [
             "",
-            None,
             "not a url",
             "https://vimeo.com/123456789",
             "https://www.dailymotion.com/video/x2v8j3k",
@@ -69,9 +96,43 @@ class TestYouTubeURLValidation:
             "youtube.com/watch?v=toolongvideoid",  # Video ID too long
         ]
 
-        for url in invalid_urls:
-            if url is not None:  # Skip None test for validate function
-                assert validate_youtube_url(url) is False, f"Should have rejected: {url}"
+        assert [url for url in invalid_urls if validate_youtube_url(url) is not False] == []
+
+    def test_less_common_url_forms(self):
+        """Test oEmbed, attribution and scheme/host edge cases."""
+        accepted = [
+            "https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/attribution_link?a=x&u=%2Fwatch%3Fv%3DdQw4w9WgXcQ",
+            "https://www.youtube.com/attribution_link?u=/watch?v=dQw4w9WgXcQ&feature=em",
+            "HTTPS://WWW.YOUTUBE.COM/EMBED/dQw4w9WgXcQ",
+            "https://youtube.com/v/dQw4w9WgXcQ&hl=en",
+        ]
+        rejected = [
+            "ftp://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com:8080/watch?v=dQw4w9WgXcQ",
+            "https://evil.com/www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube-nocookie.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube.com/oembed?url=https://evil.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/channel/dQw4w9WgXcQ",
+        ]
+
+        assert [url for url in accepted if validate_youtube_url(url) is not True] == []
+        assert [url for url in rejected if validate_youtube_url(url) is not False] == []
+
+    def test_watch_query_skips_unparseable_params(self):
+        """Test valueless params and an invalid v= don't end the query scan."""
+        for url in (
+            "https://www.youtube.com/watch?a&b=c&v=dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=x&v=dQw4w9WgXcQ",
+        ):
+            assert validate_youtube_url(url) is True, url
+            assert parse_youtube_url(url) == extract_video_id(url) == "dQw4w9WgXcQ"
+
+    def test_long_query_without_video_id_is_linear(self):
+        """Test many params without v= are rejected without backtracking."""
+        url = "https://www.youtube.com/watch?" + "a=b&" * 5000 + "x"
+
+        assert validate_youtube_url(url) is False
 
 
 class TestVideoIDExtraction:
@@ -87,9 +148,8 @@ class TestVideoIDExtraction:
             ("https://www.youtube.com/watch?v=yZ-K7nCVnBI&list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf", "yZ-K7nCVnBI"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_from_short_urls(self):
         """Test extraction from youtu.be short URLs."""
@@ -99,9 +159,8 @@ class TestVideoIDExtraction:
             ("http://youtu.be/oTJRivZTMLs?list=PLToa5JuFMsXTNkrLJbRlB--76IAOjRM9b", "oTJRivZTMLs"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_from_embed_urls(self):
         """Test extraction from embed URLs."""
@@ -111,9 +170,8 @@ class TestVideoIDExtraction:
             ("https://www.youtube-nocookie.com/embed/up_lNV-yoK4?rel=0", "up_lNV-yoK4"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_from_v_urls(self):
         """Test extraction from /v/ URLs."""
@@ -122,9 +180,8 @@ class TestVideoIDExtraction:
             ("youtube.com/v/DFYRQ_zQ-gk?fs=1&amp;hl=en_US&amp;rel=0", "DFYRQ_zQ-gk"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_from_shorts_and_live(self):
         """Test extraction from shorts and live URLs."""
@@ -135,9 +192,8 @@ class TestVideoIDExtraction:
             ("youtube.com/live/DFYRQ_zQ-gk?feature=share", "DFYRQ_zQ-gk"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_from_music_youtube(self):
         """Test extraction from music.youtube.com URLs."""
@@ -146,9 +202,8 @@ class TestVideoIDExtraction:
             ("music.youtube.com/watch?v=DFYRQ_zQ-gk&feature=share", "DFYRQ_zQ-gk"),
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
 
     def test_extract_with_special_characters(self):
         """Test extraction with video IDs containing special characters."""
@@ -158,9 +213,41 @@ class TestVideoIDExtraction:
             ("https://www.youtube.com/watch?v=_OBlgSz8sSM", "_OBlgSz8sSM"),  # Underscore
         ]
 
-        for url, expected_id in test_cases:
-            result = extract_video_id(url)
-            assert result == expected_id, f"Failed to extract from {url}. Got {result}, expected {expected_id}"
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
+
+    def test_extract_fast_path_falls_back_to_patterns(self):
+        """Test URLs the string fast path rejects still reach the full patterns."""
+        test_cases = [
+            ("https://YOUTU.BE/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/watch?V=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://x.com/?v=short&v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/embed/dQw4w9WgXcQ?v=tooshort", "dQw4w9WgXcQ"),
+        ]
+
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
+
+    def test_extract_is_case_insensitive_outside_the_id(self):
+        """Test uppercase URL tokens match while the ID keeps its case."""
+        test_cases = [
+            ("HTTPS://WWW.YOUTUBE.COM/EMBED/dQw4w9WgXcQ?REL=0", "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/Shorts/DFYRQ_zQ-gk", "DFYRQ_zQ-gk"),
+            ("https://www.youtube.com/attribution_link?u=%2FWATCH%3FV%3DdQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            # 'İ' lowercases to two characters; offsets must not shift
+            ("İ https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("İ https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        ]
+
+        extracted = {url: extract_video_id(url) for url, _ in test_cases}
+        assert extracted == dict(test_cases)
+
+    def test_extract_prefers_leftmost_id(self):
+        """Test that with two candidate IDs the one earliest in the URL wins."""
+        url = "https://youtu.be/embed/dQw4w9WgXcQ&v=AAAAAAAAAAA"
+
+        assert extract_video_id(url) == "dQw4w9WgXcQ"
+        assert extract_video_id(url) == parse_youtube_url(url)
 
     def test_extract_returns_none_for_invalid(self):
         """Test that extraction returns None for invalid URLs."""
@@ -176,9 +263,54 @@ class TestVideoIDExtraction:
             "youtube.com/watch?v=waytoolongvideoid",  # Too long
         ]
 
-        for url in invalid_urls:
-            result = extract_video_id(url)
-            assert result is None, f"Should return None for {url}, got {result}"
+        extracted = {url: extract_video_id(url) for url in invalid_urls}
+        assert extracted == dict.fromkeys(invalid_urls)
+
+
+class TestParseYouTubeURL:
+    """Test the combined validate-and-extract parser."""
+
+    def test_parse_returns_id_for_valid_urls(self):
+        """Test valid URLs yield their video ID."""
+        test_cases = [
+            ("https://www.youtube.com/watch?time_continue=506&v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("youtu.be/DFYRQ_zQ-gk", "DFYRQ_zQ-gk"),
+            ("https://www.youtube-nocookie.com/embed/up_lNV-yoK4?rel=0", "up_lNV-yoK4"),
+            ("youtube.com/live/DFYRQ_zQ-gk?feature=share", "DFYRQ_zQ-gk"),
+        ]
+
+        parsed = {url: parse_youtube_url(url) for url, _ in test_cases}
+        assert parsed == dict(test_cases)
+
+    def test_parse_returns_none_for_invalid_urls(self):
+        """Test invalid URLs yield None."""
+        for url in ["", None, "https://vimeo.com/123456789", "youtube.com/watch?v=tooshort"]:
+            assert parse_youtube_url(url) is None
+
+    def test_parse_rejects_non_ascii_ids(self):
+        """Test that IDs must be ASCII letters, digits, '_' or '-'."""
+        assert parse_youtube_url("https://youtu.be/dQw4w9WgXcé") is None
+        assert parse_youtube_url("https://www.youtube.com/watch?v=dQw4w9WgXc١") is None
+
+    def test_parse_is_memoized(self):
+        """Test that a URL parsed again is answered without re-parsing."""
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        assert parse_youtube_url(url) == "dQw4w9WgXcQ"
+
+        with patch('src.clipdrop.youtube.urlsplit') as mock_split:
+            assert validate_youtube_url(url) is True
+            assert parse_youtube_url(url) == "dQw4w9WgXcQ"
+
+        mock_split.assert_not_called()
+
+    def test_parse_rejects_non_youtube_without_splitting(self):
+        """Test URLs that cannot name a YouTube host skip URL parsing."""
+        with patch('src.clipdrop.youtube.urlsplit') as mock_split:
+            assert parse_youtube_url("https://example.com/watch?v=dQw4w9WgXcQ") is None
+            assert validate_youtube_url("https://example.com/embed/dQw4w9WgXcQ") is False
+
+        mock_split.assert_not_called()
+        assert parse_youtube_url("HTTPS://WWW.YOUTUBE.COM/watch?v=dQw4w9WgXcQ") == "dQw4w9WgXcQ"
 
 
 class TestYTDLPCheck:
@@ -218,9 +350,23 @@ class TestYTDLPCheck:
         assert "yt-dlp found at: /opt/homebrew/bin/yt-dlp" in message
         mock_which.assert_called_once_with('yt-dlp')
 
+    @patch('shutil.which')
+    def test_ytdlp_lookup_cached_per_path(self, mock_which, monkeypatch):
+        """Test PATH is scanned once and rescanned only when it changes."""
+        mock_which.return_value = "/usr/local/bin/yt-dlp"
+        monkeypatch.setenv('PATH', '/usr/local/bin')
+
+        check_ytdlp_installed()
+        check_ytdlp_installed()
+        assert mock_which.call_count == 1
+
+        monkeypatch.setenv('PATH', '/opt/homebrew/bin')
+        check_ytdlp_installed()
+        assert mock_which.call_count == 2
+
 
 def _metadata_json(manual_subs=None, auto_subs=None, **overrides):
-    """Build a yt-dlp -J style JSON payload for mocking."""
+    """Build the JSON object yt-dlp prints for the metadata template, as bytes."""
     data = {
         'title': 'Test Video',
         'id': 'dQw4w9WgXcQ',
@@ -235,131 +381,129 @@ def _metadata_json(manual_subs=None, auto_subs=None, **overrides):
         'automatic_captions': auto_subs or {},
     }
     data.update(overrides)
-    return json.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+class _FakeDownloadError(Exception):
+    """Stands in for yt_dlp.utils.DownloadError."""
+
+
+def _fake_ytdlp_api(fake_ydl):
+    """A stand-in yt_dlp module whose YoutubeDL is fake_ydl."""
+    fake_api = MagicMock()
+    fake_api.YoutubeDL.return_value = fake_ydl
+    fake_api.utils.DownloadError = _FakeDownloadError
+    return fake_api
+
+
+# The default metadata, serialized once for the many tests that use it as-is
+_METADATA_JSON = _metadata_json()
+
+# Caption maps shared by the caption listing tests, serialized once
+_ENGLISH_TRACK = [{"name": "English", "ext": "vtt"}]
+_MANUAL_AND_AUTO_JSON = _metadata_json(
+    manual_subs={"en": _ENGLISH_TRACK, "es": [{"name": "Spanish", "ext": "vtt"}]},
+    # The auto English track should be skipped
+    auto_subs={"fr": [{"name": "French", "ext": "vtt"}], "en": _ENGLISH_TRACK},
+)
+_AUTO_ONLY_JSON = _metadata_json(auto_subs={"en": _ENGLISH_TRACK})
+
+_VTT_BLOB = "WEBVTT\n\n00:00:01.000 --> 00:00:04.000\nHello, world!\n"
 
 
 class TestCaptionListing:
     """Test caption listing functionality."""
 
-    @patch('subprocess.run')
-    @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_list_captions_with_manual_and_auto(self, mock_check, mock_run):
-        """Test listing captions with both manual and auto-generated subtitles."""
-        mock_check.return_value = (True, "yt-dlp found")
+    URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
 
-        manual_subs = {
-            "en": [{"name": "English", "ext": "vtt"}],
-            "es": [{"name": "Spanish", "ext": "vtt"}]
-        }
-        auto_subs = {
-            "fr": [{"name": "French", "ext": "vtt"}],
-            "en": [{"name": "English", "ext": "vtt"}]  # Should be skipped
-        }
+    @pytest.fixture
+    def ytdlp_result(self, monkeypatch):
+        """Make yt-dlp look installed and answer every run with one result."""
+        monkeypatch.setattr(youtube, "check_ytdlp_installed", lambda: (True, "yt-dlp found"))
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json(manual_subs, auto_subs)
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        def install(returncode=0, stdout=b"", stderr=""):
+            result = SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+            monkeypatch.setattr("subprocess.run", lambda *args, **kwargs: result)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            captions = list_captions(
-                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", cache_dir=tmpdir
-            )
+        return install
+
+    def test_list_captions_with_manual_and_auto(self, ytdlp_result, tmp_path):
+        """Test listing captions with both manual and auto-generated subtitles."""
+        ytdlp_result(stdout=_MANUAL_AND_AUTO_JSON)
+
+        captions = list_captions(self.URL, cache_dir=str(tmp_path))
 
         assert len(captions) == 3
         assert ("en", "English", False) in captions
         assert ("es", "Spanish", False) in captions
         assert ("fr", "French (auto-generated)", True) in captions
 
-    @patch('subprocess.run')
-    @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_list_captions_auto_only(self, mock_check, mock_run):
+    def test_list_captions_auto_only(self, ytdlp_result, tmp_path):
         """Test listing captions with only auto-generated subtitles."""
-        mock_check.return_value = (True, "yt-dlp found")
-
-        auto_subs = {
-            "en": [{"name": "English", "ext": "vtt"}]
-        }
-
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json({}, auto_subs)
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        ytdlp_result(stdout=_AUTO_ONLY_JSON)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            captions = list_captions(
-                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", cache_dir=tmpdir
-            )
+        captions = list_captions(self.URL, cache_dir=str(tmp_path))
 
         assert len(captions) == 1
         assert captions[0] == ("en", "English (auto-generated)", True)
+        assert captions[0].lang_code == "en" and captions[0].is_auto
+
+    def test_list_captions_auto_suffix_and_order(self, ytdlp_result, tmp_path):
+        """Auto names get one suffix (any case) and the list is sorted by code."""
+        ytdlp_result(stdout=_metadata_json(
+            manual_subs={'fr': [{'name': 'French'}]},
+            auto_subs={
+                'fr': [{'name': 'French'}],
+                'de': [{'name': 'German (Auto-Generated)'}],
+                'ar': [],
+            },
+        ))
+
+        captions = list_captions("https://youtu.be/dQw4w9WgXcQ", cache_dir=str(tmp_path))
+
+        assert captions == [
+            ("ar", "ar (auto-generated)", True),
+            ("de", "German (Auto-Generated)", True),
+            ("fr", "French", False),
+        ]
 
-    @patch('subprocess.run')
-    @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_list_captions_no_captions(self, mock_check, mock_run):
+    def test_list_captions_no_captions(self, ytdlp_result, tmp_path, monkeypatch):
         """Test listing captions when no captions are available."""
-        import pytest
         from src.clipdrop.exceptions import NoCaptionsError
 
-        mock_check.return_value = (True, "yt-dlp found")
+        ytdlp_result(stdout=_METADATA_JSON)
+        extract_calls = []
+        monkeypatch.setattr(youtube, "extract_video_id", extract_calls.append)
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json()
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        with pytest.raises(NoCaptionsError, match="dQw4w9WgXcQ"):
+            list_captions(self.URL, cache_dir=str(tmp_path))
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(NoCaptionsError):
-                list_captions(
-                    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-                    cache_dir=tmpdir
-                )
+        assert extract_calls == []
 
     def test_list_captions_invalid_url(self):
         """Test listing captions with invalid URL."""
-        import pytest
         from src.clipdrop.exceptions import YouTubeURLError
 
         with pytest.raises(YouTubeURLError):
             list_captions("https://vimeo.com/123456789")
 
-    @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_list_captions_ytdlp_not_installed(self, mock_check):
+    def test_list_captions_ytdlp_not_installed(self, monkeypatch, tmp_path):
         """Test listing captions when yt-dlp is not installed."""
-        import pytest
         from src.clipdrop.exceptions import YTDLPNotFoundError
 
-        mock_check.return_value = (False, "yt-dlp not found")
+        monkeypatch.setattr(youtube, "check_ytdlp_installed", lambda: (False, "yt-dlp not found"))
 
         with pytest.raises(YTDLPNotFoundError):
-            list_captions("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+            list_captions(self.URL, cache_dir=str(tmp_path))
 
-    @patch('subprocess.run')
-    @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_list_captions_ytdlp_error(self, mock_check, mock_run):
+    def test_list_captions_ytdlp_error(self, ytdlp_result, tmp_path):
         """Test handling yt-dlp errors."""
-        import pytest
         from src.clipdrop.exceptions import YouTubeError
 
-        mock_check.return_value = (True, "yt-dlp found")
-
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Video unavailable"
-        mock_run.return_value = mock_result
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with pytest.raises(YouTubeError) as exc_info:
-                list_captions(
-                    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-                    cache_dir=tmpdir
-                )
+        ytdlp_result(returncode=1, stderr="Video unavailable")
 
-        assert "Failed to fetch video info" in str(exc_info.value)
+        with pytest.raises(YouTubeError, match="Failed to fetch video info"):
+            list_captions(self.URL, cache_dir=str(tmp_path))
 
 
 class TestCaptionSelection:
@@ -416,6 +560,17 @@ class TestCaptionSelection:
         selected = select_caption_track(captions, "en")
         assert selected == ("en", "English", False)
 
+    def test_select_tie_keeps_first_caption(self):
+        """Test equally scored captions resolve to the earliest one."""
+        captions = [
+            ("fr", "French (auto-generated)", True),
+            ("en-US", "English (United States)", False),
+            ("en-GB", "English (United Kingdom)", False),
+        ]
+
+        selected = select_caption_track(captions, "en")
+        assert selected == ("en-US", "English (United States)", False)
+
     def test_select_no_preference(self):
         """Test selecting without language preference."""
         captions = [
@@ -439,6 +594,17 @@ class TestCaptionSelection:
         # Should return English (default language when no preference)
         assert selected == ("en", "English (auto-generated)", True)
 
+    def test_select_no_preference_prefers_auto_english_over_other_manual(self):
+        """Test auto-generated English beats a manual track in another language."""
+        captions = [
+            ("de", "German", False),
+            ("en", "English (auto-generated)", True),
+            ("en-US", "English (United States) (auto-generated)", True),
+        ]
+
+        selected = select_caption_track(captions, None)
+        assert selected == ("en", "English (auto-generated)", True)
+
     def test_select_default_english(self):
         """Test defaulting to English when no preference specified."""
         captions = [
@@ -491,6 +657,14 @@ class TestCacheHelpers:
         expected = Path.home() / ".cache" / "clipdrop" / "youtube" / video_id
         assert cache_dir == expected
 
+    def test_get_cache_dir_default_follows_home(self, monkeypatch, tmp_path):
+        """Test the cached default base still tracks a changed home directory."""
+        get_cache_dir("dQw4w9WgXcQ")
+        monkeypatch.setenv(youtube._HOME_ENV, str(tmp_path))
+
+        expected = tmp_path / ".cache" / "clipdrop" / "youtube" / "dQw4w9WgXcQ"
+        assert get_cache_dir("dQw4w9WgXcQ") == expected
+
     def test_get_cache_dir_custom(self):
         """Test getting cache directory with custom path."""
         video_id = "dQw4w9WgXcQ"
@@ -509,6 +683,23 @@ class TestCacheHelpers:
             assert cache_path.exists()
             assert cache_path.is_dir()
 
+    def test_ensure_cache_dir_existing_skips_mkdir(self):
+        """An existing cache directory is not created again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(Path, 'mkdir') as mock_mkdir:
+                ensure_cache_dir(Path(tmpdir))
+
+        mock_mkdir.assert_not_called()
+
+    def test_ensure_cache_dir_checks_each_dir_once(self, tmp_path):
+        """A directory already ensured in this process is not stat()ed again."""
+        ensure_cache_dir(tmp_path / "cache")
+
+        with patch.object(Path, 'is_dir') as mock_is_dir:
+            ensure_cache_dir(tmp_path / "cache")
+
+        mock_is_dir.assert_not_called()
+
     def test_sanitize_filename(self):
         """Test filename sanitization."""
         # Test with special characters
@@ -529,85 +720,129 @@ class TestCacheHelpers:
         sanitized = sanitize_filename(title)
         assert sanitized == "Test Title"
 
+    def test_sanitize_filename_replaces_every_reserved_char(self):
+        """Each reserved character maps to an underscore, others are kept."""
+        assert sanitize_filename('a<b>c:d"e/f\\g|h?i*j') == 'a_b_c_d_e_f_g_h_i_j'
+        assert sanitize_filename('Ünïcödé — ok') == 'Ünïcödé — ok'
+
 
 class TestVTTDownload:
     """Test VTT download functionality."""
 
     @patch('subprocess.run')
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    @patch('src.clipdrop.youtube.Path.exists')
-    def test_download_vtt_from_cache(self, mock_exists, mock_check, mock_run):
+    def test_download_vtt_from_cache(self, mock_check, mock_run, tmp_path):
         """Test returning VTT from cache when it exists."""
         mock_check.return_value = (True, "yt-dlp found")
-        mock_exists.return_value = True
+        cached = tmp_path / "dQw4w9WgXcQ" / "dQw4w9WgXcQ.en.vtt"
+        cached.parent.mkdir()
+        cached.write_text(_VTT_BLOB)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = download_vtt(
-                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-                "en",
-                tmpdir
-            )
+        result = download_vtt(
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "en",
+            str(tmp_path)
+        )
 
-            # Should return cached path without running yt-dlp
-            assert "dQw4w9WgXcQ.en.vtt" in result
-            mock_run.assert_not_called()
+        # Should return cached path without running (or looking for) yt-dlp
+        assert result == str(cached)
+        mock_run.assert_not_called()
+        mock_check.assert_not_called()
 
     @patch('subprocess.run')
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    @patch('src.clipdrop.youtube.Path.exists')
-    @patch('src.clipdrop.youtube.ensure_cache_dir')
-    def test_download_vtt_new(self, mock_ensure, mock_exists, mock_check, mock_run):
+    def test_download_vtt_new(self, mock_check, mock_run, tmp_path):
         """Test downloading new VTT file."""
         mock_check.return_value = (True, "yt-dlp found")
-        # First call checks cache (doesn't exist), second checks after download
-        mock_exists.side_effect = [False, True]
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        def write_vtt(cmd, **kwargs):
+            # Save the file where yt-dlp's -o template points
+            template = cmd[cmd.index('-o') + 1]
+            Path(template.replace('%(lang)s', 'en').replace('%(ext)s', 'vtt')).write_text(_VTT_BLOB)
+            return SimpleNamespace(returncode=0, stdout=None, stderr="")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = download_vtt(
-                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
-                "en",
-                tmpdir
-            )
+        mock_run.side_effect = write_vtt
+
+        result = download_vtt(
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "en",
+            str(tmp_path)
+        )
+
+        assert result == str(tmp_path / "dQw4w9WgXcQ" / "dQw4w9WgXcQ.en.vtt")
+        assert Path(result).read_text() == _VTT_BLOB
+        mock_run.assert_called_once()
+
+        # Check yt-dlp command
+        call_args = mock_run.call_args[0][0]
+        assert 'yt-dlp' in call_args
+        assert '--skip-download' in call_args
+        assert '--sub-format' in call_args
+        assert 'vtt' in call_args
+        assert '--sub-lang' in call_args
+        assert 'en' in call_args
+
+        # Metadata-only flags: no playlist expansion, no media manifests
+        assert '--no-playlist' in call_args
+        assert call_args[call_args.index('--extractor-args') + 1] == 'youtube:skip=dash,hls'
+
+        # No inherited stdin; stdout discarded, stderr kept for errors
+        import subprocess
+        call_kwargs = mock_run.call_args[1]
+        assert call_kwargs['stdin'] is subprocess.DEVNULL
+        assert call_kwargs['stdout'] is subprocess.DEVNULL
+        assert call_kwargs['stderr'] is subprocess.PIPE
+
+    @pytest.mark.parametrize("written", [
+        "dQw4w9WgXcQ.en.vtt",
+        "dQw4w9WgXcQ.NA.en-US.vtt",
+        "dQw4w9WgXcQ.NA.en.vtt",
+    ])
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_download_vtt_renames_alternate_names(self, mock_check, mock_run, tmp_path, written):
+        """Test files yt-dlp named differently are renamed to the expected path."""
+        mock_check.return_value = (True, "yt-dlp found")
+        video_dir = tmp_path / "dQw4w9WgXcQ"
+
+        def write_vtt(cmd, **kwargs):
+            (video_dir / written).write_text(_VTT_BLOB)
+            return SimpleNamespace(returncode=0, stdout=None, stderr="")
 
-            assert "dQw4w9WgXcQ.en.vtt" in result
-            mock_run.assert_called_once()
-
-            # Check yt-dlp command
-            call_args = mock_run.call_args[0][0]
-            assert 'yt-dlp' in call_args
-            assert '--skip-download' in call_args
-            assert '--sub-format' in call_args
-            assert 'vtt' in call_args
-            assert '--sub-lang' in call_args
-            assert 'en' in call_args
-
-    @patch('src.clipdrop.youtube.subprocess.run')
-    @patch('src.clipdrop.youtube.Path.exists')
-    @patch('src.clipdrop.youtube.ensure_cache_dir')
+        mock_run.side_effect = write_vtt
+
+        result = download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en-US", str(tmp_path))
+
+        assert result == str(video_dir / "dQw4w9WgXcQ.en-US.vtt")
+        assert Path(result).read_text() == _VTT_BLOB
+        assert not (video_dir / written).exists()
+
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_download_vtt_success_without_file(self, mock_check, mock_run, tmp_path):
+        """Test a yt-dlp run that writes no VTT under any name is reported."""
+        from src.clipdrop.exceptions import NoCaptionsError
+
+        mock_check.return_value = (True, "yt-dlp found")
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=None, stderr="")
+
+        with pytest.raises(NoCaptionsError, match="en-US"):
+            download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en-US", str(tmp_path))
+
+    @patch('subprocess.run')
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_download_vtt_no_captions(self, mock_check, mock_ensure, mock_exists, mock_run):
+    def test_download_vtt_no_captions(self, mock_check, mock_run, tmp_path):
         """Test handling when no captions are available."""
         import pytest
         from src.clipdrop.exceptions import NoCaptionsError
 
         mock_check.return_value = (True, "yt-dlp found")
-        # VTT file doesn't exist in cache
-        mock_exists.return_value = False
 
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "No subtitles found"
+        mock_result = SimpleNamespace(returncode=1, stdout="", stderr="No subtitles found")
         mock_run.return_value = mock_result
 
         with pytest.raises(NoCaptionsError):
-            download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en")
+            download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en", str(tmp_path))
 
     def test_download_vtt_invalid_url(self):
         """Test downloading VTT with invalid URL."""
@@ -618,7 +853,7 @@ class TestVTTDownload:
             download_vtt("https://vimeo.com/123456789", "en")
 
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_download_vtt_ytdlp_not_installed(self, mock_check):
+    def test_download_vtt_ytdlp_not_installed(self, mock_check, tmp_path):
         """Test downloading VTT when yt-dlp is not installed."""
         import pytest
         from src.clipdrop.exceptions import YTDLPNotFoundError
@@ -626,7 +861,7 @@ class TestVTTDownload:
         mock_check.return_value = (False, "yt-dlp not found")
 
         with pytest.raises(YTDLPNotFoundError):
-            download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en")
+            download_vtt("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "en", cache_dir=str(tmp_path))
 
 
 class TestVideoInfo:
@@ -662,10 +897,11 @@ class TestVideoInfo:
         """Test fetching new info when cache is expired."""
         mock_check.return_value = (True, "yt-dlp found")
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json(title='New Title')
-        mock_result.stderr = ""
+        mock_result = SimpleNamespace(
+            returncode=0,
+            stdout=_metadata_json(title='New Title'),
+            stderr="",
+        )
         mock_run.return_value = mock_result
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -678,13 +914,18 @@ class TestVideoInfo:
                 'id': 'dQw4w9WgXcQ',
                 'cached_at': old_time.isoformat()
             }
-            (cache_path / "metadata.json").write_text(json.dumps(cached_data))
+            metadata_file = cache_path / "metadata.json"
+            metadata_file.write_text(json.dumps(cached_data))
+            os.utime(metadata_file, (old_time.timestamp(), old_time.timestamp()))
 
-            result = get_video_info(
-                "https://www.youtube.com/watch?v=dQw4w9WgXcQ", cache_dir=tmpdir
-            )
+            with patch('builtins.open', wraps=open) as mock_open:
+                result = get_video_info(
+                    "https://www.youtube.com/watch?v=dQw4w9WgXcQ", cache_dir=tmpdir
+                )
 
         assert result['title'] == 'New Title'
+        # The stale file is judged by its mtime alone, never read
+        assert all(call.args[1] == 'wb' for call in mock_open.call_args_list)
         mock_run.assert_called_once()
 
     @patch('subprocess.run')
@@ -693,18 +934,19 @@ class TestVideoInfo:
         """Test fetching new video info."""
         mock_check.return_value = (True, "yt-dlp found")
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json(
-            description='Test Description',
-            view_count=1000000,
-            like_count=50000,
-            chapters=[
-                {"title": "Intro", "start_time": 0},
-                {"title": "Main", "start_time": 60}
-            ]
+        mock_result = SimpleNamespace(
+            returncode=0,
+            stdout=_metadata_json(
+                description='Test Description',
+                view_count=1000000,
+                like_count=50000,
+                chapters=[
+                    {"title": "Intro", "start_time": 0},
+                    {"title": "Main", "start_time": 60}
+                ]
+            ),
+            stderr="",
         )
-        mock_result.stderr = ""
         mock_run.return_value = mock_result
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -730,8 +972,10 @@ class TestVideoInfo:
         call_args = mock_run.call_args[0][0]
         assert 'yt-dlp' in call_args
         assert '--skip-download' in call_args
-        assert '-J' in call_args
         assert '--ignore-no-formats-error' in call_args
+        template = call_args[call_args.index('--print') + 1]
+        for field in ('title', 'chapters', 'subtitles', 'automatic_captions'):
+            assert field in template
 
     @patch('subprocess.run')
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
@@ -739,12 +983,13 @@ class TestVideoInfo:
         """get_video_info + list_captions should cost one network call."""
         mock_check.return_value = (True, "yt-dlp found")
 
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = _metadata_json(
-            {"en": [{"name": "English", "ext": "vtt"}]}
+        mock_result = SimpleNamespace(
+            returncode=0,
+            stdout=_metadata_json(
+                {"en": [{"name": "English", "ext": "vtt"}]}
+            ),
+            stderr="",
         )
-        mock_result.stderr = ""
         mock_run.return_value = mock_result
 
         url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
@@ -756,6 +1001,197 @@ class TestVideoInfo:
         assert captions == [("en", "English", False)]
         mock_run.assert_called_once()
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_metadata_cache_round_trip(self, mock_check, mock_run, use_orjson, monkeypatch):
+        """Metadata written to disk reloads identically with either JSON backend."""
+        if not use_orjson:
+            monkeypatch.setattr(youtube.fastjson, "orjson", None)
+        elif youtube.fastjson.orjson is None:
+            pytest.skip("orjson not installed")
+        mock_check.return_value = (True, "yt-dlp found")
+        mock_run.return_value = SimpleNamespace(
+            returncode=0, stdout=_metadata_json(title="Tëst 世界"), stderr=""
+        )
+
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fetched = get_video_info(url, cache_dir=tmpdir)
+            youtube._METADATA_MEMO.clear()
+            reloaded = get_video_info(url, cache_dir=tmpdir)
+            raw = (Path(tmpdir) / "dQw4w9WgXcQ" / "metadata.json").read_text(encoding="utf-8")
+
+        assert reloaded == fetched
+        assert reloaded['title'] == "Tëst 世界"
+        assert "Tëst 世界" in raw
+        mock_run.assert_called_once()
+
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_repeat_fetch_served_from_memory(self, mock_check, mock_run):
+        """A second lookup in the same run skips yt-dlp and the disk cache."""
+        mock_check.return_value = (True, "yt-dlp found")
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=_METADATA_JSON, stderr="")
+
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = get_video_info(url, cache_dir=tmpdir)
+            (Path(tmpdir) / "dQw4w9WgXcQ" / "metadata.json").unlink()
+            second = get_video_info(url, cache_dir=tmpdir)
+
+        assert second == first
+        mock_run.assert_called_once()
+        mock_check.assert_called_once()
+
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_metadata_extracted_in_process(self, mock_check, mock_run, monkeypatch):
+        """With yt-dlp importable, metadata comes from the library, not a subprocess."""
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.return_value = {
+            'title': 'Library Video',
+            'id': 'dQw4w9WgXcQ',
+            'formats': [{'url': 'https://example.com/video'}],
+            'subtitles': {'en': [{'ext': 'vtt', 'name': 'English'}]},
+        }
+        fake_api = _fake_ytdlp_api(fake_ydl)
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: fake_api)
+
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            info = get_video_info(url, cache_dir=tmpdir)
+            youtube._METADATA_MEMO.clear()
+            (Path(tmpdir) / "dQw4w9WgXcQ" / "metadata.json").unlink()
+            get_video_info(url, cache_dir=tmpdir)
+
+        assert info['title'] == 'Library Video'
+        assert info['subtitles'] == {'en': [{'name': 'English'}]}
+        assert 'formats' not in info
+        fake_api.YoutubeDL.assert_called_once()
+        assert fake_ydl.extract_info.call_count == 2
+        mock_run.assert_not_called()
+        mock_check.assert_not_called()
+
+    @pytest.mark.parametrize("failure", [
+        SystemExit(2),  # parse_options rejected an option
+        AttributeError("'YoutubeDL' object has no attribute 'extract_info'"),
+    ])
+    @patch('subprocess.run')
+    def test_in_process_library_failure_falls_back_to_command(self, mock_run, monkeypatch, failure):
+        """A failure of the library itself is retried through the yt-dlp command."""
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = failure
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: _fake_ytdlp_api(fake_ydl))
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=_METADATA_JSON, stderr="")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            info = get_video_info("https://youtu.be/dQw4w9WgXcQ", cache_dir=tmpdir)
+
+        assert info['title'] == 'Test Video'
+        mock_run.assert_called_once()
+
+    @patch('src.clipdrop.youtube.time.sleep')
+    @patch('subprocess.run')
+    def test_in_process_download_error_is_reported(self, mock_run, mock_sleep, monkeypatch):
+        """YouTube-side errors are raised without a second extraction by command."""
+        from src.clipdrop.exceptions import YouTubeError
+
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = _FakeDownloadError("ERROR: [youtube] dQw4w9WgXcQ: Video unavailable")
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: _fake_ytdlp_api(fake_ydl))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(YouTubeError) as exc_info:
+                get_video_info("https://youtu.be/dQw4w9WgXcQ", cache_dir=tmpdir)
+
+        assert type(exc_info.value) is YouTubeError
+        assert "Failed to fetch video info: ERROR: [youtube]" in str(exc_info.value)
+        fake_ydl.extract_info.assert_called_once()
+        mock_sleep.assert_not_called()
+        mock_run.assert_not_called()
+
+    @patch('src.clipdrop.youtube.time.sleep')
+    @patch('subprocess.run')
+    def test_in_process_rate_limit_retries_then_raises(self, mock_run, mock_sleep, monkeypatch):
+        """HTTP 429 in-process is retried with backoff, like the command path."""
+        from src.clipdrop.exceptions import YouTubeRateLimitError
+        from src.clipdrop.youtube import MAX_ATTEMPTS, RETRY_BASE_DELAY
+
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = _FakeDownloadError("HTTP Error 429: Too Many Requests")
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: _fake_ytdlp_api(fake_ydl))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(YouTubeRateLimitError):
+                get_video_info("https://youtu.be/dQw4w9WgXcQ", cache_dir=tmpdir)
+
+        assert fake_ydl.extract_info.call_count == MAX_ATTEMPTS
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [
+            RETRY_BASE_DELAY * 2 ** i for i in range(MAX_ATTEMPTS - 1)
+        ]
+        mock_run.assert_not_called()
+
+    @patch('src.clipdrop.youtube.time.sleep')
+    @patch('subprocess.run')
+    def test_in_process_rate_limit_recovers_on_retry(self, mock_run, mock_sleep, monkeypatch):
+        """A 429 followed by success returns the library's metadata."""
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = [
+            _FakeDownloadError("HTTP Error 429: Too Many Requests"),
+            {'title': 'Library Video', 'id': 'dQw4w9WgXcQ'},
+        ]
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: _fake_ytdlp_api(fake_ydl))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            info = get_video_info("https://youtu.be/dQw4w9WgXcQ", cache_dir=tmpdir)
+
+        assert info['title'] == 'Library Video'
+        mock_sleep.assert_called_once()
+        mock_run.assert_not_called()
+
+    @patch('src.clipdrop.youtube.time.sleep')
+    def test_in_process_timeout_retries_with_fresh_client(self, mock_sleep, monkeypatch):
+        """An attempt that overruns its timeout is abandoned and retried."""
+        import threading
+        from src.clipdrop.exceptions import YouTubeError
+        from src.clipdrop.youtube import MAX_ATTEMPTS
+
+        release = threading.Event()
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = lambda *a, **k: release.wait(5)
+        fake_api = _fake_ytdlp_api(fake_ydl)
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: fake_api)
+
+        try:
+            with pytest.raises(YouTubeError, match="Timeout while contacting YouTube"):
+                youtube._extract_metadata_inprocess("https://youtu.be/dQw4w9WgXcQ", timeout=0.01)
+        finally:
+            release.set()
+
+        assert fake_ydl.extract_info.call_count == MAX_ATTEMPTS
+        assert fake_api.YoutubeDL.call_count == MAX_ATTEMPTS
+        assert mock_sleep.call_count == MAX_ATTEMPTS - 1
+
+    @patch('subprocess.run')
+    def test_in_process_bot_check_retries_fallback_client(self, mock_run, monkeypatch):
+        """A bot check retries once in-process with the fallback player client."""
+        from src.clipdrop.exceptions import YouTubeBotCheckError
+
+        fake_ydl = MagicMock()
+        fake_ydl.extract_info.side_effect = _FakeDownloadError("Sign in to confirm you're not a bot")
+        fake_api = _fake_ytdlp_api(fake_ydl)
+        monkeypatch.setattr(youtube, "_ytdlp_api", lambda: fake_api)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(YouTubeBotCheckError):
+                get_video_info("https://youtu.be/dQw4w9WgXcQ", cache_dir=tmpdir)
+
+        assert fake_ydl.extract_info.call_count == 2
+        last_argv = fake_api.parse_options.call_args[0][0]
+        assert 'youtube:skip=dash,hls;player_client=mweb' in last_argv
+        mock_run.assert_not_called()
+
     def test_get_video_info_invalid_url(self):
         """Test getting info with invalid URL."""
         import pytest
@@ -765,7 +1201,7 @@ class TestVideoInfo:
             get_video_info("https://vimeo.com/123456789")
 
     @patch('src.clipdrop.youtube.check_ytdlp_installed')
-    def test_get_video_info_ytdlp_not_installed(self, mock_check):
+    def test_get_video_info_ytdlp_not_installed(self, mock_check, tmp_path):
         """Test getting info when yt-dlp is not installed."""
         import pytest
         from src.clipdrop.exceptions import YTDLPNotFoundError
@@ -773,7 +1209,7 @@ class TestVideoInfo:
         mock_check.return_value = (False, "yt-dlp not found")
 
         with pytest.raises(YTDLPNotFoundError):
-            get_video_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+            get_video_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ", cache_dir=str(tmp_path))
 
 
 class TestVTTParser:
@@ -1128,10 +1564,7 @@ class TestBlockingRobustness:
 
     @staticmethod
     def _failed(stderr):
-        result = MagicMock()
-        result.returncode = 1
-        result.stdout = ""
-        result.stderr = stderr
+        result = SimpleNamespace(returncode=1, stdout="", stderr=stderr)
         return result
 
     @patch('subprocess.run')
@@ -1157,24 +1590,45 @@ class TestBlockingRobustness:
         """A bot check triggers one retry with the fallback player client."""
         mock_check.return_value = (True, "yt-dlp found")
 
-        success = MagicMock()
-        success.returncode = 0
-        success.stdout = _metadata_json()
-        success.stderr = ""
-        mock_run.side_effect = [
+        success = SimpleNamespace(returncode=0, stdout=_METADATA_JSON, stderr="")
+        mock_run.side_effect = (
             self._failed("Sign in to confirm you're not a bot"),
             success,
-        ]
+        )
 
         with tempfile.TemporaryDirectory() as tmpdir:
             result = get_video_info(self.URL, cache_dir=tmpdir)
 
         assert result['title'] == 'Test Video'
         assert mock_run.call_count == 2
-        second_cmd = mock_run.call_args_list[1][0][0]
-        assert '--extractor-args' in second_cmd
+        first_cmd, second_cmd = (call[0][0] for call in mock_run.call_args_list)
+        assert 'player_client' not in first_cmd[first_cmd.index('--extractor-args') + 1]
         client_arg = second_cmd[second_cmd.index('--extractor-args') + 1]
-        assert 'player_client=mweb' in client_arg
+        assert client_arg == 'youtube:skip=dash,hls;player_client=mweb'
+
+    @patch('subprocess.run')
+    @patch('src.clipdrop.youtube.check_ytdlp_installed')
+    def test_bytes_output_parsed_without_text_mode(self, mock_check, mock_run):
+        """yt-dlp runs in binary mode; stdout is parsed as bytes, stderr decoded."""
+        import pytest
+        from src.clipdrop.exceptions import YouTubeBotCheckError
+
+        mock_check.return_value = (True, "yt-dlp found")
+        mock_run.return_value = SimpleNamespace(
+            returncode=0,
+            stdout=_metadata_json(title="Café"),
+            stderr=b"",
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            assert get_video_info(self.URL, cache_dir=tmpdir)['title'] == "Café"
+        assert 'text' not in mock_run.call_args[1]
+
+        youtube._METADATA_MEMO.clear()
+        mock_run.return_value = self._failed(b"ERROR: Sign in to confirm you\xe2\x80\x99re not a bot")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(YouTubeBotCheckError):
+                get_video_info(self.URL, cache_dir=tmpdir)
 
     @patch('src.clipdrop.youtube.time.sleep')
     @patch('subprocess.run')
@@ -1202,14 +1656,11 @@ class TestBlockingRobustness:
         """A 429 followed by success returns normally."""
         mock_check.return_value = (True, "yt-dlp found")
 
-        success = MagicMock()
-        success.returncode = 0
-        success.stdout = _metadata_json()
-        success.stderr = ""
-        mock_run.side_effect = [
+        success = SimpleNamespace(returncode=0, stdout=_METADATA_JSON, stderr="")
+        mock_run.side_effect = (
             self._failed("HTTP Error 429: Too Many Requests"),
             success,
-        ]
+        )
 
         with tempfile.TemporaryDirectory() as tmpdir:
             result = get_video_info(self.URL, cache_dir=tmpdir)
@@ -1225,10 +1676,7 @@ class TestBlockingRobustness:
 
         mock_check.return_value = (True, "yt-dlp found")
 
-        success = MagicMock()
-        success.returncode = 0
-        success.stdout = _metadata_json()
-        success.stderr = ""
+        success = SimpleNamespace(returncode=0, stdout=_METADATA_JSON, stderr="")
         mock_run.return_value = success
 
         with patch.dict('os.environ', {ENV_COOKIES_FROM_BROWSER: 'firefox'}):
@@ -1303,9 +1751,7 @@ class TestYtdlpVersion:
     def test_get_ytdlp_version(self, mock_run):
         from src.clipdrop.youtube import get_ytdlp_version
 
-        result = MagicMock()
-        result.returncode = 0
-        result.stdout = "2026.03.17\n"
+        result = SimpleNamespace(returncode=0, stdout="2026.03.17\n")
         mock_run.return_value = result
 
         assert get_ytdlp_version() == "2026.03.17"